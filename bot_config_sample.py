@@ -4,4 +4,13 @@
 # Get your bot token from @BotFather on Telegram
 TELEGRAM_BOT_TOKEN = "YOUR_BOT_TOKEN_HERE"
 
-# Example: TELEGRAM_BOT_TOKEN = "1234567890:ABCdefGHIjklMNOPqrstuVWXyz1234567890"
\ No newline at end of file
+# Example: TELEGRAM_BOT_TOKEN = "1234567890:ABCdefGHIjklMNOPqrstuVWXyz1234567890"
+
+# Optional webhook mode - public HTTPS base URL that forwards to PORT on this machine
+# Leave WEBHOOK_URL as None to use long polling instead
+WEBHOOK_URL = None  # Example: "https://bot.example.com"
+PORT = 8443
+
+# Optional Redis for user sessions (survives restarts, shared across bot workers)
+# Leave as None to keep sessions in memory
+REDIS_URL = None  # Example: "redis://localhost:6379/0"
\ No newline at end of file
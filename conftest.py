@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures - heavy components are built once per test session
+
+Project modules are imported inside the fixtures, so selecting a subset of tests (-k)
+only loads the dependencies those tests actually use (pandas, yfinance, telegram).
+"""
+
+import os
+import shutil
+import pytest
+
+# Liquid ETFs the price/volume tests exercise
+SAMPLE_ETFS = ['GOLDBEES', 'NIFTYBEES', 'BANKBEES', 'ITBEES', 'HNGSNGBEES']
+
+# Files the app reads and writes relative to the working directory (copied per test process when present)
+STATE_FILES = ("etf_data.json", "volume_filter_config.json", "investment_config.json",
+               "etf_symbol_mappings.json", "etf-list.xlsx")
+
+# Days of synthetic daily bars served per symbol (enough for the 20-day MA)
+SYNTHETIC_DAYS = 22
+
+def _synthetic_bars(yahoo_symbol: str):
+    """Deterministic (closes, volumes) for a symbol - same input, same bars, every run"""
+    import zlib
+    import numpy as np
+    rng = np.random.default_rng(zlib.crc32(yahoo_symbol.encode()))
+    closes = 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.01, SYNTHETIC_DAYS))
+    volumes = rng.integers(20_000, 2_000_000, SYNTHETIC_DAYS).astype(np.float64)
+    return closes, volumes
+
+def _network_disabled(*args, **kwargs):
+    raise RuntimeError("Tests run offline - this path would reach Yahoo; serve it from the synthetic bars instead")
+
+@pytest.fixture(scope="session")
+def offline_quotes():
+    """
+    Serve PriceFetcher's Yahoo transports from synthetic data for the whole session
+    
+    Only the raw transports are replaced - the chart endpoint and yf.download return the
+    synthetic bars - so the history cache above them (and prefetch_history) still runs.
+    Ticker/async paths raise, so a new code path that bypasses them fails loudly instead
+    of quietly hitting the network.
+    """
+    import pandas as pd
+    from price_fetcher import PriceFetcher, yf
+    
+    def fetch_chart(self, yahoo_symbol, period="1mo"):
+        closes, volumes = _synthetic_bars(yahoo_symbol)
+        return {'close': closes, 'volume': volumes}
+    
+    def download(tickers, **kwargs):
+        index = pd.bdate_range(end="2025-01-31", periods=SYNTHETIC_DAYS)
+        return pd.concat({
+            ticker: pd.DataFrame(dict(zip(('Close', 'Volume'), _synthetic_bars(ticker))), index=index)
+            for ticker in tickers.split()
+        }, axis=1)
+    
+    with pytest.MonkeyPatch.context() as patcher:
+        patcher.setattr(PriceFetcher, "fetch_yahoo_chart", fetch_chart)
+        patcher.setattr(yf, "download", download)
+        for transport in ("fetch_yahoo_chart_async", "_get_ticker"):
+            patcher.setattr(PriceFetcher, transport, _network_disabled)
+        yield
+
+@pytest.fixture(scope="session")
+def state_dir(tmp_path_factory):
+    """
+    Private copy of the data/config files, made the working directory for the session
+    
+    Each xdist worker is its own process with its own tmp_path_factory base, so parallel
+    modules never read or write the repo's etf_data.json / volume config (or each other's).
+    """
+    state = tmp_path_factory.mktemp("state")
+    for name in STATE_FILES:
+        if os.path.exists(name):
+            shutil.copy2(name, state / name)
+    
+    with pytest.MonkeyPatch.context() as patcher:
+        patcher.chdir(state)
+        yield state
+
+@pytest.fixture(scope="session")
+def data_manager(state_dir):
+    """One data store for the whole session (JSON state loaded once)"""
+    from etf_data_manager import ETFDataManager
+    return ETFDataManager(str(state_dir / "etf_data.json"))
+
+@pytest.fixture(scope="session")
+def price_fetcher(offline_quotes):
+    from price_fetcher import PriceFetcher
+    return PriceFetcher()
+
+@pytest.fixture(scope="session")
+def sample_etfs():
+    return list(SAMPLE_ETFS)
+
+@pytest.fixture(scope="session")
+def prefetched_history(price_fetcher, sample_etfs):
+    """Fetch the sample ETFs' daily bars in one batched call; returns how many landed in the history cache"""
+    return price_fetcher.prefetch_history(sample_etfs)
+
+@pytest.fixture(scope="session")
+def volume_filter(state_dir, data_manager, price_fetcher):
+    from volume_filter import VolumeFilter
+    return VolumeFilter(data_manager, price_fetcher)
+
+@pytest.fixture(scope="session")
+def investment_manager(state_dir, data_manager):
+    from investment_manager import InvestmentManager
+    return InvestmentManager(data_manager)
+
+@pytest.fixture(scope="session")
+def strategy(data_manager, volume_filter):
+    from trading_strategy import ETFTradingStrategy
+    return ETFTradingStrategy(data_manager, volume_filter)
+
+@pytest.fixture(scope="session")
+def bot(state_dir, offline_quotes):
+    """Telegram bot instance; building it registers no handlers and makes no network calls"""
+    from telegram_bot import ETFTradingBot
+    try:
+        from bot_config import BOT_TOKEN
+    except ImportError:
+        BOT_TOKEN = "dummy_token"
+    return ETFTradingBot(BOT_TOKEN)
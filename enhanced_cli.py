@@ -3,6 +3,7 @@
 Enhanced Command Line Interface with Live Price Fetching
 """
 
+import logging
 import sys
 from etf_data_manager import ETFDataManager
 from trading_strategy import ETFTradingStrategy
@@ -159,17 +160,17 @@ class EnhancedETFCLI:
         if choice == '1':
             # Fetch from Yahoo Finance
             data = self.price_fetcher.fetch_yahoo_finance_data(etf_name)
-            if data and data.get('current_price') and data.get('ma_20'):
+            if data and data.current_price and data.ma_20:
                 self.data_manager.update_etf_price(
                     etf_name,
-                    data['current_price'],
-                    data['ma_20']
+                    data.current_price,
+                    data.ma_20
                 )
                 print(f"✅ Updated {etf_name}:")
-                print(f"   Current Price: ₹{data['current_price']:.2f}")
-                print(f"   20-day MA: ₹{data['ma_20']:.2f}")
-                print(f"   Volume: {data.get('volume', 0):,}")
-                print(f"   Change: {data.get('change_percent', 0):.2f}%")
+                print(f"   Current Price: ₹{data.current_price:.2f}")
+                print(f"   20-day MA: ₹{data.ma_20:.2f}")
+                print(f"   Volume: {data.volume:,}")
+                print(f"   Change: {data.change_percent:.2f}%")
             else:
                 print(f"❌ Failed to fetch data for {etf_name}")
         
@@ -575,14 +576,14 @@ class EnhancedETFCLI:
         print("\n🏆 ETF Rankings")
         print("-" * 40)
         
-        rankings = self.data_manager.get_etf_rankings()
+        rankings = self.data_manager.get_etf_rankings(top_n=20)
         
         if rankings:
             print("Ranked by deviation from 20-day moving average:")
             print(f"{'Rank':<6}{'ETF':<12}{'CMP':<10}{'20DMA':<10}{'Deviation'}")
             print("-" * 50)
             
-            for i, (etf_name, cmp, dma_20, deviation) in enumerate(rankings[:20], 1):
+            for i, (etf_name, cmp, dma_20, deviation) in enumerate(rankings, 1):
                 print(f"{i:<6}{etf_name:<12}₹{cmp:<9.2f}₹{dma_20:<9.2f}{deviation:>8.2f}%")
         else:
             print("No ETF data available. Please update prices first.")
@@ -882,5 +883,6 @@ class EnhancedETFCLI:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     cli = EnhancedETFCLI()
     cli.run()
\ No newline at end of file
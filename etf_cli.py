@@ -150,14 +150,14 @@ class ETFCommandLineInterface:
         print("\n🏆 ETF Rankings")
         print("-" * 40)
         
-        rankings = self.data_manager.get_etf_rankings()
+        rankings = self.data_manager.get_etf_rankings(top_n=20)
         
         if rankings:
             print("Ranked by deviation from 20-day moving average:")
             print(f"{'Rank':<6}{'ETF':<12}{'CMP':<10}{'20DMA':<10}{'Deviation'}")
             print("-" * 50)
             
-            for i, (etf_name, cmp, dma_20, deviation) in enumerate(rankings[:20], 1):
+            for i, (etf_name, cmp, dma_20, deviation) in enumerate(rankings, 1):
                 print(f"{i:<6}{etf_name:<12}₹{cmp:<9.2f}₹{dma_20:<9.2f}{deviation:>8.2f}%")
         else:
             print("No ETF data available. Please update prices first.")
@@ -1,21 +1,72 @@
+import hashlib
+import heapq
 import json
+import os
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
 import pandas as pd
+from openpyxl import load_workbook
 from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple
+from functools import cached_property, lru_cache
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+def dumps_json(obj) -> bytes:
+    """Indented JSON bytes - orjson's C encoder when installed (numpy scalars/arrays included), else stdlib"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, default=str).encode()
+
+def loads_json(payload: bytes):
+    """Parse JSON bytes with orjson when installed, else stdlib"""
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+def _column_number(letters: str) -> int:
+    """1-based index of a spreadsheet column ("A" -> 1, "AB" -> 28)"""
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number
+
+@lru_cache(maxsize=None)
+def canonical_etf_name(raw_name: str) -> str:
+    """Trimmed, upper-case ETF symbol; memoized so each distinct raw name is normalized once"""
+    return sys.intern(raw_name.strip().upper())
+
 class ETFDataManager:
     """Manages ETF data, prices, and portfolio with JSON storage"""
     
     def __init__(self, data_file: str = "etf_data.json"):
         self.data_file = data_file
+        self._saved_digest = None  # SHA-256 of the last payload written, to skip no-op saves
         self.data = self._load_data()
     
     def _load_data(self) -> Dict:
         """Load data from JSON file or create default structure"""
         try:
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
+            with open(self.data_file, 'rb') as f:
+                return loads_json(f.read())
         except FileNotFoundError:
             return {
                 "etfs": {},
@@ -24,32 +75,224 @@ class ETFDataManager:
                 "last_updated": None
             }
     
+    @cached_property
+    def etf_names(self) -> frozenset:
+        """Frozen set of ETF names in the store (cached until the ETF list changes)"""
+        return frozenset(self.data["etfs"])
+    
+    def invalidate_etf_names(self):
+        """Drop the cached etf_names after adding, removing or renaming ETFs"""
+        self.__dict__.pop("etf_names", None)
+    
+    @cached_property
+    def held_etf_names(self) -> frozenset:
+        """Frozen set of ETFs with at least one active holding (cached until the portfolio changes)"""
+        return frozenset(holding["etf_name"] for holding in self.data["portfolio"] if holding["status"] == "active")
+    
+    def invalidate_held_etf_names(self):
+        """Drop the cached held_etf_names after buying, selling or renaming holdings"""
+        self.__dict__.pop("held_etf_names", None)
+    
+    @cached_property
+    def volume_disqualified_etf_names(self) -> frozenset:
+        """Frozen set of ETFs explicitly flagged volume_qualified=False (unchecked ETFs count as qualified)"""
+        return frozenset(
+            etf_name for etf_name, etf_data in self.data["etfs"].items()
+            if etf_data.get("volume_qualified") is False
+        )
+    
+    def invalidate_volume_flags(self):
+        """Drop the cached volume_disqualified_etf_names after volume_qualified flags change"""
+        self.__dict__.pop("volume_disqualified_etf_names", None)
+    
     def _save_data(self):
         """Save data to JSON file"""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=2, default=str)
+        self.invalidate_etf_names()
+        self.invalidate_held_etf_names()
+        self.invalidate_volume_flags()
+        payload = dumps_json(self.data)
+        digest = hashlib.sha256(payload).digest()
+        if digest == self._saved_digest:
+            return
+        # Write a per-process temp file and swap it in, so concurrent writers (e.g. parallel test workers)
+        # never leave a half-written store behind
+        tmp_file = f"{self.data_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, self.data_file)
+        self._saved_digest = digest
+    
+    def iter_etf_names_from_excel(self, excel_file: str) -> Iterator[str]:
+        """
+        Stream column A of the first sheet straight out of the xlsx ZIP
+        
+        SAX-style pass over sharedStrings.xml and the sheet XML - no workbook object
+        model, constant memory. Skips the header row and blank cells.
+        """
+        with zipfile.ZipFile(excel_file) as archive:
+            # Resolve the first sheet's part name through the workbook relationships
+            workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+            first_sheet = workbook.find(f"{{{XLSX_MAIN_NS}}}sheets/{{{XLSX_MAIN_NS}}}sheet")
+            rel_id = first_sheet.get(f"{{{XLSX_REL_NS}}}id")
+            rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+            target = next(rel.get("Target") for rel in rels if rel.get("Id") == rel_id)
+            sheet_path = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+            
+            shared = []
+            if "xl/sharedStrings.xml" in archive.namelist():
+                with archive.open("xl/sharedStrings.xml") as f:
+                    for _, elem in ET.iterparse(f, events=("end",)):
+                        if elem.tag == f"{{{XLSX_MAIN_NS}}}si":
+                            shared.append("".join(t.text or "" for t in elem.iter(f"{{{XLSX_MAIN_NS}}}t")))
+                            elem.clear()
+            
+            with archive.open(sheet_path) as f:
+                # <row r> and <c r> are optional in the spec: a missing one follows the previous row/cell
+                row_num = col_num = 0
+                for event, elem in ET.iterparse(f, events=("start", "end")):
+                    if event == "start":
+                        if elem.tag == f"{{{XLSX_MAIN_NS}}}row":
+                            row_num = int(elem.get("r") or row_num + 1)
+                            col_num = 0
+                        continue
+                    
+                    if elem.tag == f"{{{XLSX_MAIN_NS}}}c":
+                        ref = elem.get("r")
+                        if ref:
+                            letters = ref.rstrip("0123456789")
+                            col_num = _column_number(letters)
+                            row_num = int(ref[len(letters):])
+                        else:
+                            col_num += 1
+                        if col_num == 1 and row_num > 1:
+                            cell_type = elem.get("t")
+                            if cell_type == "inlineStr":
+                                value = "".join(t.text or "" for t in elem.iter(f"{{{XLSX_MAIN_NS}}}t"))
+                            else:
+                                v = elem.find(f"{{{XLSX_MAIN_NS}}}v")
+                                value = v.text if v is not None else None
+                                if cell_type == "s" and value is not None:
+                                    value = shared[int(value)]
+                            if value:
+                                yield value
+                    elif elem.tag == f"{{{XLSX_MAIN_NS}}}row":
+                        elem.clear()
+    
+    def _read_first_column(self, excel_file: str) -> List:
+        """Read the first column of the first sheet, skipping the header row and blanks"""
+        if CalamineWorkbook is not None:
+            # Rust-backed parser, much faster than openpyxl for plain value reads
+            rows = CalamineWorkbook.from_path(excel_file).get_sheet_by_index(0).to_python()
+            return [row[0] for row in rows[1:] if row and row[0] not in (None, "")]
+        
+        try:
+            return list(self.iter_etf_names_from_excel(excel_file))
+        except (KeyError, ValueError, RuntimeError, AttributeError, zipfile.BadZipFile, ET.ParseError):
+            pass  # Unusual workbook layout - let openpyxl handle it
+        
+        # Read-only streaming mode: we only need the first column of the first sheet
+        workbook = load_workbook(excel_file, read_only=True, data_only=True, keep_links=False)
+        try:
+            worksheet = workbook.worksheets[0]
+            return [
+                row[0] for row in worksheet.iter_rows(min_row=2, min_col=1, max_col=1, values_only=True)
+                if row[0] is not None
+            ]
+        finally:
+            workbook.close()
+    
+    def _load_etf_list_cache(self, excel_file: str, key: List[int]) -> Optional[List[str]]:
+        """Return cached ETF names if the sidecar was built from this exact file version"""
+        if pq is None:
+            return None
+        
+        base = os.path.splitext(excel_file)[0]
+        try:
+            with open(f"{base}.cache.meta.json", 'r') as f:
+                if json.load(f).get("key") != key:
+                    return None
+            return pq.read_table(f"{base}.cache.parquet").column(0).to_pylist()
+        except (OSError, ValueError, pa.ArrowException):
+            return None
+    
+    def _save_etf_list_cache(self, excel_file: str, key: List[int], etf_names: List[str]):
+        """Write the parsed names to a parquet sidecar, replacing files atomically"""
+        if pq is None:
+            return
+        
+        base = os.path.splitext(excel_file)[0]
+        try:
+            table = pa.Table.from_arrays([pa.array([str(name) for name in etf_names])], names=["etf"])
+            pq.write_table(table, f"{base}.cache.parquet.tmp")
+            os.replace(f"{base}.cache.parquet.tmp", f"{base}.cache.parquet")
+            
+            with open(f"{base}.cache.meta.json.tmp", 'w') as f:
+                json.dump({"key": key}, f)
+            os.replace(f"{base}.cache.meta.json.tmp", f"{base}.cache.meta.json")
+        except (OSError, pa.ArrowException):
+            pass
+    
+    def stream_etf_list_from_excel(self, excel_file: str) -> Iterator[str]:
+        """Yield canonical, non-empty ETF names from the Excel file without touching the ETF store"""
+        stat = os.stat(excel_file)
+        source = self._load_etf_list_cache(excel_file, [stat.st_mtime_ns, stat.st_size])
+        
+        if source is None:
+            # Read the column fully before yielding anything: a reader that fails mid-sheet must
+            # fall back without having already handed out names (_read_first_column does that)
+            source = self._read_first_column(excel_file)
+        
+        for etf_name in source:
+            etf_name = canonical_etf_name(str(etf_name))
+            if etf_name:
+                yield etf_name
     
     def load_etf_list_from_excel(self, excel_file: str) -> List[str]:
-        """Load ETF names from Excel file"""
-        df = pd.read_excel(excel_file)
-        # Assuming the first column contains ETF names
-        etf_names = df.iloc[:, 0].tolist()
-        
-        # Initialize ETF data structure if not exists
-        for etf_name in etf_names:
-            if etf_name not in self.data["etfs"]:
-                self.data["etfs"][etf_name] = {
+        """Load ETF names from Excel file; returns the canonical names"""
+        # Skip Excel parsing entirely when the file is unchanged since the last load
+        stat = os.stat(excel_file)
+        cache_key = [stat.st_mtime_ns, stat.st_size]
+        
+        etf_names = self._load_etf_list_cache(excel_file, cache_key)
+        if etf_names is None:
+            etf_names = self._read_first_column(excel_file)
+            self._save_etf_list_cache(excel_file, cache_key, etf_names)
+        
+        # Initialize ETF data structure if not exists; warm starts usually add nothing and skip the save
+        self.add_etfs(etf_names)
+        return [canonical for canonical in (canonical_etf_name(str(etf_name)) for etf_name in etf_names) if canonical]
+    
+    def add_etfs(self, etf_names: Iterable[str], initial_price: float = None, initial_ma: float = None) -> List[str]:
+        """
+        Add several ETFs in memory and persist once; returns the canonical names actually added
+        
+        ETFs are keyed by canonical_etf_name, with the name as written kept in display_name.
+        Existing keys are compared in canonical form too, so older stores with stray case or
+        whitespace don't get a second entry for the same ETF.
+        """
+        existing = {canonical_etf_name(etf_name) for etf_name in self.data["etfs"]}
+        new_etfs = {}
+        for raw_name in etf_names:
+            display_name = str(raw_name).strip()
+            etf_name = canonical_etf_name(display_name)
+            if etf_name and etf_name not in existing and etf_name not in new_etfs:
+                new_etfs[etf_name] = {
                     "name": etf_name,
-                    "cmp": None,
-                    "dma_20": None,
+                    "display_name": display_name,
+                    "cmp": initial_price,
+                    "dma_20": initial_ma,
                     "last_price_update": None,
                     "deviation_percent": None
                 }
         
-        self._save_data()
-        return etf_names
+        if new_etfs:
+            self.data["etfs"].update(new_etfs)
+            self.invalidate_etf_names()
+            self._save_data()
+        
+        return list(new_etfs)
     
-    def update_etf_price(self, etf_name: str, cmp: float, dma_20: float):
+    def update_etf_price(self, etf_name: str, cmp: float, dma_20: float, save: bool = True):
         """Update ETF current market price and 20-day moving average"""
         if etf_name not in self.data["etfs"]:
             self.data["etfs"][etf_name] = {"name": etf_name}
@@ -64,10 +307,27 @@ class ETFDataManager:
             "deviation_percent": deviation_percent
         })
         
-        self._save_data()
+        if save:
+            self._save_data()
     
-    def get_etf_rankings(self) -> List[Tuple[str, float, float, float]]:
-        """Get ETFs ranked by deviation from 20-day moving average (ascending)"""
+    def update_etf_prices_bulk(self, rows: Iterable[Tuple[str, float, float]]) -> int:
+        """Apply (etf_name, cmp, dma_20) rows in memory and save once; returns rows applied"""
+        count = 0
+        for etf_name, cmp, dma_20 in rows:
+            self.update_etf_price(etf_name, cmp, dma_20, save=False)
+            count += 1
+        
+        if count:
+            self._save_data()
+        return count
+    
+    def get_etf_rankings(self, top_n: int = None) -> List[Tuple[str, float, float, float]]:
+        """
+        Get ETFs ranked by deviation from 20-day moving average (ascending)
+        
+        Args:
+            top_n: Only return the N most fallen ETFs (partial heap selection instead of a full sort)
+        """
         rankings = []
         
         for etf_name, etf_data in self.data["etfs"].items():
@@ -81,7 +341,9 @@ class ETFDataManager:
                 ))
         
         # Sort by deviation (ascending - most fallen first)
-        rankings.sort(key=lambda x: x[3])
+        if top_n is not None:
+            return heapq.nsmallest(top_n, rankings, key=itemgetter(3))
+        rankings.sort(key=itemgetter(3))
         return rankings
     
     def get_current_holdings(self) -> Dict[str, List[Dict]]:
@@ -171,9 +433,11 @@ class ETFDataManager:
         
         return sell_transaction
     
-    def get_etfs_for_averaging(self, loss_threshold: float = -2.5) -> List[Tuple[str, float, float]]:
+    def get_etfs_for_averaging(self, loss_threshold: float = -2.5,
+                               current_holdings: Dict[str, List[Dict]] = None) -> List[Tuple[str, float, float]]:
         """Get ETFs that are suitable for averaging down (below loss threshold)"""
-        current_holdings = self.get_current_holdings()
+        if current_holdings is None:
+            current_holdings = self.get_current_holdings()
         averaging_candidates = []
         
         for etf_name, holdings in current_holdings.items():
@@ -195,9 +459,11 @@ class ETFDataManager:
         averaging_candidates.sort(key=lambda x: x[1])
         return averaging_candidates
     
-    def get_etfs_for_selling(self, profit_threshold: float = 6.0) -> List[Tuple[str, float, float, Dict]]:
+    def get_etfs_for_selling(self, profit_threshold: float = 6.0,
+                             current_holdings: Dict[str, List[Dict]] = None) -> List[Tuple[str, float, float, Dict]]:
         """Get ETFs that meet the selling criteria (above profit threshold)"""
-        current_holdings = self.get_current_holdings()
+        if current_holdings is None:
+            current_holdings = self.get_current_holdings()
         selling_candidates = []
         
         for etf_name, holdings in current_holdings.items():
@@ -221,9 +487,10 @@ class ETFDataManager:
         selling_candidates.sort(key=lambda x: x[1], reverse=True)
         return selling_candidates
     
-    def get_portfolio_summary(self) -> Dict:
+    def get_portfolio_summary(self, holdings: Dict[str, List[Dict]] = None) -> Dict:
         """Get portfolio summary with current values"""
-        holdings = self.get_current_holdings()
+        if holdings is None:
+            holdings = self.get_current_holdings()
         summary = {
             "total_etfs": len(holdings),
             "total_investments": 0,
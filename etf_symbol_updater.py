@@ -4,6 +4,8 @@ ETF Symbol Updater - Handle ETF name changes and symbol updates
 """
 
 import json
+import os
+import shutil
 import pandas as pd
 from datetime import datetime
 from etf_data_manager import ETFDataManager
@@ -40,6 +42,21 @@ class ETFSymbolUpdater:
         with open(self.symbol_mapping_file, 'w') as f:
             json.dump(self.symbol_mappings, f, indent=2, default=str)
     
+    def plan_files(self, plan) -> List[str]:
+        """Files that applying the plan's renames would rewrite (empty when there is nothing to rename)"""
+        if not plan.renames:
+            return []
+        return [self.data_manager.data_file]
+    
+    def create_incremental_backup(self, files: List[str]) -> str:
+        """Copy only the given files into backups/incremental/<timestamp>/; returns the directory"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        backup_dir = os.path.join("backups", "incremental", timestamp)
+        os.makedirs(backup_dir, exist_ok=True)
+        for path in files:
+            shutil.copy2(path, os.path.join(backup_dir, os.path.basename(path)))
+        return backup_dir
+    
     def add_symbol_mapping(self, old_symbol: str, new_symbol: str, reason: str = ""):
         """Add a new symbol mapping"""
         print(f"📝 Adding symbol mapping: {old_symbol} → {new_symbol}")
@@ -60,7 +77,7 @@ class ETFSymbolUpdater:
         self.save_symbol_mappings()
         print(f"✅ Symbol mapping saved: {old_symbol} → {new_symbol}")
     
-    def update_etf_data_with_new_symbol(self, old_symbol: str, new_symbol: str):
+    def update_etf_data_with_new_symbol(self, old_symbol: str, new_symbol: str, save: bool = True):
         """Update ETF data when symbol changes"""
         print(f"\n🔄 Updating ETF data: {old_symbol} → {new_symbol}")
         
@@ -92,13 +109,54 @@ class ETFSymbolUpdater:
         
         # Remove old symbol
         del self.data_manager.data["etfs"][old_symbol]
+        self.data_manager.invalidate_etf_names()
         
         # Save updated data
-        self.data_manager._save_data()
+        if save:
+            self.data_manager._save_data()
         
         print(f"✅ Successfully updated all data: {old_symbol} → {new_symbol}")
         return True
     
+    def update_etf_symbols(self, pairs: List[Tuple[str, str]]) -> Dict[str, bool]:
+        """Apply several symbol renames in memory and save once; returns success per old symbol"""
+        etfs = self.data_manager.data["etfs"]
+        results = {}
+        renames = {}
+        
+        # Move each ETF entry to its new key
+        for old_symbol, new_symbol in pairs:
+            if old_symbol not in etfs:
+                print(f"⚠️ Old symbol {old_symbol} not found in ETF data")
+                results[old_symbol] = False
+                continue
+            
+            entry = etfs.pop(old_symbol)
+            entry["name"] = new_symbol
+            etfs[new_symbol] = entry
+            renames[old_symbol] = new_symbol
+            results[old_symbol] = True
+        
+        if renames:
+            self.data_manager.invalidate_etf_names()
+            
+            # One pass over holdings and transactions for the whole batch
+            for section in ("portfolio", "transactions"):
+                updated = 0
+                for record in self.data_manager.data[section]:
+                    new_symbol = renames.get(record["etf_name"])
+                    if new_symbol is not None:
+                        record["etf_name"] = new_symbol
+                        updated += 1
+                print(f"📊 Updated {updated} {section} records")
+            
+            self.data_manager._save_data()
+        
+        for old_symbol, new_symbol in renames.items():
+            print(f"✅ Successfully updated all data: {old_symbol} → {new_symbol}")
+        
+        return results
+    
     def sync_with_excel_file(self, excel_file: str = "etf-list.xlsx"):
         """Sync with updated Excel file and detect changes"""
         print(f"\n📊 Syncing with {excel_file}...")
@@ -129,6 +187,7 @@ class ETFSymbolUpdater:
                         "deviation_percent": None
                     }
                     print(f"   ✅ Added: {symbol}")
+                self.data_manager.invalidate_etf_names()
             
             if removed_symbols:
                 print(f"\n🔄 Removed/renamed symbols: {removed_symbols}")
@@ -257,7 +316,7 @@ class ETFSymbolUpdater:
             print(f"   Testing {symbol}...", end="")
             try:
                 data = fetcher.fetch_yahoo_finance_data(symbol)
-                if data and data.get('current_price'):
+                if data and data.current_price:
                     valid_symbols.append(symbol)
                     print(" ✅")
                 else:
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+ETF Sync Planning - pure diff/pairing logic for the Excel name sync
+
+No I/O and fully annotated so it can be compiled ahead of time with mypyc:
+    mypyc --ignore-missing-imports etf_sync.py
+The interpreted module is used when no compiled build is present.
+"""
+
+import difflib
+from dataclasses import dataclass, field
+from typing import AbstractSet, Iterable, List, Set, Tuple
+import numpy as np
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # Fall back to difflib scoring
+    process = None  # type: ignore[assignment]
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # Fall back to greedy best-score pairing
+    linear_sum_assignment = None
+
+# Minimum similarity (0-100) for an old/new name pair to be treated as a rename
+RENAME_SCORE_THRESHOLD = 60
+
+@dataclass
+class SyncPlan:
+    """Changes needed to bring the system ETF list in line with the Excel file"""
+    renames: List[Tuple[str, str]] = field(default_factory=list)
+    adds: List[str] = field(default_factory=list)
+    removes: List[str] = field(default_factory=list)  # Reported only; data is kept
+    common: AbstractSet[str] = frozenset()
+    only_in_current: List[str] = field(default_factory=list)  # Sorted
+    only_in_excel: List[str] = field(default_factory=list)  # Sorted
+
+def _similarity_matrix(old_etfs: List[str], new_etfs: List[str]) -> np.ndarray:
+    """Score every old/new name pair on a 0-100 scale"""
+    if process is not None:
+        return process.cdist(old_etfs, new_etfs, scorer=fuzz.ratio, dtype=np.float64)
+    
+    scores = np.empty((len(old_etfs), len(new_etfs)), dtype=np.float64)
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    for j, new_etf in enumerate(new_etfs):
+        matcher.set_seq2(new_etf)  # seq2 is the side difflib caches
+        for i, old_etf in enumerate(old_etfs):
+            matcher.set_seq1(old_etf)
+            scores[i, j] = matcher.ratio() * 100
+    return scores
+
+def pair_renames(old_etfs: List[str], new_etfs: List[str],
+                 threshold: float = RENAME_SCORE_THRESHOLD) -> List[Tuple[str, str]]:
+    """Match old names to new names by string similarity (optimal one-to-one assignment)"""
+    if not old_etfs or not new_etfs:
+        return []
+    
+    scores = _similarity_matrix(old_etfs, new_etfs)
+    
+    candidates: List[Tuple[int, int]] = []
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(-scores)
+        candidates = list(zip(rows.tolist(), cols.tolist()))
+    else:
+        # Greedy: take the best remaining pair until one side runs out
+        order = np.argsort(-scores, axis=None, kind="stable")
+        used_rows: Set[int] = set()
+        used_cols: Set[int] = set()
+        for flat in order.tolist():
+            i, j = divmod(flat, scores.shape[1])
+            if i in used_rows or j in used_cols:
+                continue
+            used_rows.add(i)
+            used_cols.add(j)
+            candidates.append((i, j))
+    
+    pairs = [(old_etfs[i], new_etfs[j]) for i, j in candidates if scores[i, j] >= threshold]
+    pairs.sort()
+    return pairs
+
+def compute_sync_plan(current_etfs: AbstractSet[str], excel_etfs: Iterable[str]) -> SyncPlan:
+    """
+    Diff the system and Excel ETF names into a SyncPlan (no I/O, no prompts)
+    
+    current_etfs may be a live dict keys view - set algebra runs on it directly,
+    so the system side is never copied into a new set.
+    """
+    excel_frozen = frozenset(excel_etfs)  # No copy when already a frozenset
+    common_etfs = current_etfs & excel_frozen
+    if len(common_etfs) == len(current_etfs) == len(excel_frozen):
+        return SyncPlan(common=common_etfs)  # Already in sync - nothing to sort or pair
+    
+    # Sort each side once; the report and the rename pairing both reuse these
+    old_etfs = sorted(current_etfs - excel_frozen)
+    new_etfs = sorted(excel_frozen - current_etfs)
+    
+    plan = SyncPlan(common=common_etfs, only_in_current=old_etfs, only_in_excel=new_etfs)
+    
+    if old_etfs and new_etfs:
+        # Potential renames: pair old and new names by similarity; weak matches stay remove/add
+        plan.renames = pair_renames(old_etfs, new_etfs)
+        renamed_old = {old_etf for old_etf, _ in plan.renames}
+        renamed_new = {new_etf for _, new_etf in plan.renames}
+        plan.removes = [etf for etf in old_etfs if etf not in renamed_old]
+        plan.adds = [etf for etf in new_etfs if etf not in renamed_new]  # Not part of renames
+    else:
+        plan.adds = new_etfs
+    
+    return plan
+
+def format_rename_preview(plan: SyncPlan) -> str:
+    """Render the rename mappings and the confirmation bullets as one string"""
+    buf = ["\n🤔 Possible mappings:\n"]
+    for old_etf, new_etf in plan.renames:
+        buf.append(f"   {old_etf} → {new_etf}?\n")
+    for old_etf in plan.removes:
+        buf.append(f"   {old_etf} → [to be removed]\n")
+    
+    buf.append("\n❓ Do you want to proceed with automatic name updates?\n")
+    buf.append("   This will:\n")
+    for old_etf, new_etf in plan.renames:
+        buf.append(
+            f"   • Rename {old_etf} to {new_etf}\n"
+            "     - Preserve all price data and volume info\n"
+            "     - Update portfolio holdings\n"
+            "     - Update transaction history\n"
+        )
+    for old_etf in plan.removes:
+        buf.append(f"   • Remove {old_etf} (no new name found)\n")
+    
+    return "".join(buf)
@@ -53,6 +53,7 @@ class ETFListManager:
         
         # Remove ETF data
         del self.data_manager.data["etfs"][etf_name]
+        self.data_manager.invalidate_etf_names()
         
         # Handle portfolio holdings
         if active_holdings:
@@ -86,6 +87,7 @@ class ETFListManager:
         }
         
         self.data_manager.data["etfs"][etf_name] = etf_data
+        self.data_manager.invalidate_etf_names()
         print(f"   ✅ Successfully added ETF: {etf_name}")
         
         if initial_price is None:
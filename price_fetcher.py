@@ -6,106 +6,493 @@ Supports multiple data sources for fetching live and historical ETF prices
 
 import yfinance as yf
 import requests
+import httpx
+from curl_cffi import requests as curl_requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+import asyncio
+import logging
 import time
+import threading
 import json
+import multiprocessing as mp
+import os
 from bs4 import BeautifulSoup
 import re
+import sys
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from types import MappingProxyType
+
+logger = logging.getLogger("price_fetcher")
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _move_mean_kernel(x: np.ndarray, w: int) -> np.ndarray:
+    """
+    Rolling mean via a running sum - O(N) regardless of window size
+    
+    Like pandas rolling(w).mean(): a window containing a NaN yields NaN, and the
+    output recovers once the gap has slid out of the window.
+    """
+    out = np.empty_like(x)
+    s = 0.0
+    missing = 0  # NaNs inside the current window
+    for i in range(len(x)):
+        if np.isnan(x[i]):
+            missing += 1
+        else:
+            s += x[i]
+        if i >= w:
+            if np.isnan(x[i - w]):
+                missing -= 1
+            else:
+                s -= x[i - w]
+        out[i] = s / w if i >= w - 1 and missing == 0 else np.nan
+    return out
+
+
+def _move_mean_numpy(x: np.ndarray, w: int) -> np.ndarray:
+    """Vectorised rolling mean used when numba is not installed (same NaN handling as the kernel)"""
+    out = np.full(len(x), np.nan)
+    if len(x) >= w:
+        nan_mask = np.isnan(x)
+        csum = np.cumsum(np.concatenate(([0.0], np.where(nan_mask, 0.0, x))))
+        cmissing = np.cumsum(np.concatenate(([0], nan_mask)))
+        sums = (csum[w:] - csum[:-w]) / w
+        out[w - 1:] = np.where(cmissing[w:] - cmissing[:-w] == 0, sums, np.nan)
+    return out
+
+
+# Compiled once and cached on disk; plain NumPy fallback otherwise.
+# No fastmath: the kernel relies on NaN checks that fastmath lets LLVM assume away.
+move_mean = njit(cache=True)(_move_mean_kernel) if njit else _move_mean_numpy
+
+
+def compute_mas(closes: np.ndarray, periods: List[int]) -> Dict[str, Optional[float]]:
+    """Latest simple moving average for each period from a single cumsum pass"""
+    # Missing bars (NaN closes from the yfinance fallback) are dropped, not allowed to poison every later sum
+    closes = closes[~np.isnan(closes)]
+    csum = np.cumsum(np.concatenate(([0.0], closes)))
+    result = {}
+    for period in periods:
+        if len(closes) >= period:
+            ma_value = (csum[-1] - csum[-1 - period]) / period
+            result[f'ma_{period}'] = round(float(ma_value), 2)
+        else:
+            result[f'ma_{period}'] = None
+    return result
+
+
+# NSE ETF symbol mapping (NSE symbol -> Yahoo Finance symbol), built once at import
+NSE_TO_YAHOO_MAPPING = MappingProxyType({
+    sys.intern(nse): sys.intern(yahoo) for nse, yahoo in {
+        'GOLDBEES': 'GOLDBEES.NS',
+        'KOTAKGOLD': 'KOTAKGOLD.NS',
+        'SETFGOLD': 'SETFGOLD.NS',
+        'HNGSNGBEES': 'HNGSNGBEES.NS',
+        'MAHKTECH': 'MAHKTECH.NS',
+        'ITBEES': 'ITBEES.NS',
+        'BANKBEES': 'BANKBEES.NS',
+        'NIFTYBEES': 'NIFTYBEES.NS',
+        'JUNIORBEES': 'JUNIORBEES.NS',
+        'LIQUIDBEES': 'LIQUIDBEES.NS',
+        'CPSE': 'CPSEETF.NS',
+        'SILVRBEES': 'SILVRBEES.NS',
+        'BHARATBOND': 'BHARATBOND.NS',
+        'PSUBNKBEES': 'PSUBNKBEES.NS',
+        'PVTBNKBEES': 'PVTBNKBEES.NS'
+    }.items()
+})
+
+
+@dataclass(slots=True)
+class ETFQuote:
+    """Price snapshot returned by fetch_yahoo_finance_data"""
+    symbol: str
+    yahoo_symbol: str
+    current_price: float
+    ma_20: Optional[float]
+    ma_50: Optional[float]
+    volume: int
+    prev_close: float
+    change_percent: float
+    last_updated: str
+    data_source: str
+    name: str
+    
+    # Dict-style access for callers written against the old dict result
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing max_calls per period, bursting up to burst"""
+    
+    def __init__(self, max_calls: int = 10, period: float = 1.0, burst: int = None):
+        self.rate = max_calls / period
+        self.capacity = burst or max_calls
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                time.sleep((1 - self.tokens) / self.rate)
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
 
 class PriceFetcher:
     """Fetches ETF prices from multiple data sources"""
     
-    def __init__(self):
+    TICKER_CACHE_SIZE = 256
+    INFO_CACHE_TTL = 3600  # seconds
+    PRICE_CACHE_TTL = 60  # seconds
+    HISTORY_CACHE_TTL = 900  # seconds
+    LISTING_GAP_DAYS = 7  # first bar this far past the requested start means the ETF listed later (not a holiday)
+    CACHE_START_SLACK_DAYS = 2  # weekdays the first cached bar may trail the requested start (holidays) and still cover it
+    
+    def __init__(self, async_client: httpx.AsyncClient = None):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         
-        # NSE ETF symbol mapping (NSE symbol -> Yahoo Finance symbol)
-        self.nse_to_yahoo_mapping = {
-            'GOLDBEES': 'GOLDBEES.NS',
-            'KOTAKGOLD': 'KOTAKGOLD.NS',
-            'SETFGOLD': 'SETFGOLD.NS',
-            'HNGSNGBEES': 'HNGSNGBEES.NS',
-            'MAHKTECH': 'MAHKTECH.NS',
-            'ITBEES': 'ITBEES.NS',
-            'BANKBEES': 'BANKBEES.NS',
-            'NIFTYBEES': 'NIFTYBEES.NS',
-            'JUNIORBEES': 'JUNIORBEES.NS',
-            'LIQUIDBEES': 'LIQUIDBEES.NS',
-            'CPSE': 'CPSEETF.NS',
-            'SILVRBEES': 'SILVRBEES.NS',
-            'BHARATBOND': 'BHARATBOND.NS',
-            'PSUBNKBEES': 'PSUBNKBEES.NS',
-            'PVTBNKBEES': 'PVTBNKBEES.NS'
-        }
-    
-    def fetch_yahoo_finance_data(self, symbol: str, period: str = "1mo") -> Optional[Dict]:
+        # Pooled keep-alive connections with retries for NSE and chart requests
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # yfinance only accepts curl_cffi sessions; share one across all tickers
+        self.yf_session = curl_requests.Session(impersonate="chrome")
+        
+        # Optional shared async client (owned by the caller, e.g. the Telegram bot)
+        self.async_client = async_client
+        
+        # Token bucket: 10 requests/sec, bursting to 20
+        self.limiter = RateLimiter(max_calls=10, period=1, burst=20)
+        
+        # NSE ETF symbol mapping (NSE symbol -> Yahoo Finance symbol), shared read-only
+        self.nse_to_yahoo_mapping = NSE_TO_YAHOO_MAPPING
+        
+        # Local symbol -> human-readable name cache (filled by get_etf_info)
+        self.etf_names = {}
+        
+        # yahoo symbol -> (Ticker, info_fetched_at, info) and (symbol, period) -> (fetched_at, history)
+        self._ticker_cache: "OrderedDict[str, Tuple[yf.Ticker, float, Dict]]" = OrderedDict()
+        self._history_cache: Dict[Tuple[str, str], Tuple[float, Tuple[np.ndarray, np.ndarray]]] = {}
+        
+        # On-disk daily history, one parquet file per symbol
+        self.history_cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "etf_strategy")
+        self._listing_dates: Optional[Dict[str, str]] = None  # symbol -> first traded day (ISO), loaded lazily
+    
+    def to_yahoo_symbol(self, symbol: str) -> str:
+        """Convert an NSE symbol to its Yahoo Finance symbol"""
+        if symbol in self.nse_to_yahoo_mapping:
+            return self.nse_to_yahoo_mapping[symbol]
+        if symbol.endswith('.NS'):
+            return symbol
+        return f"{symbol}.NS"
+    
+    def fetch_yahoo_finance_data(self, symbol: str, period: str = "1mo", fetch_info: bool = False) -> Optional["ETFQuote"]:
         """
         Fetch ETF data from Yahoo Finance
         
         Args:
             symbol: ETF symbol (will be converted to Yahoo format)
             period: Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            fetch_info: Also call ticker.info for the long name (extra HTTP request)
         
         Returns:
-            Dictionary with price data and moving averages
+            ETFQuote with price data and moving averages
         """
         try:
             # Convert NSE symbol to Yahoo Finance format
-            if symbol in self.nse_to_yahoo_mapping:
-                yahoo_symbol = self.nse_to_yahoo_mapping[symbol]
-            elif not symbol.endswith('.NS'):
-                yahoo_symbol = f"{symbol}.NS"
-            else:
-                yahoo_symbol = symbol
+            yahoo_symbol = self.to_yahoo_symbol(symbol)
             
-            print(f"Fetching data for {symbol} ({yahoo_symbol}) from Yahoo Finance...")
+            logger.info("Fetching data for %s (%s) from Yahoo Finance...", symbol, yahoo_symbol)
             
-            ticker = yf.Ticker(yahoo_symbol)
+            history = self._fetch_history_ndarray(yahoo_symbol, period)
             
-            # Get historical data
-            hist = ticker.history(period=period)
-            
-            if hist.empty:
-                print(f"No data found for {yahoo_symbol}")
+            if history is None:
+                logger.warning("No data found for %s", yahoo_symbol)
                 return None
             
-            # Get current price (latest close)
-            current_price = float(hist['Close'].iloc[-1])
+            closes, volumes = history
+            
+            # Get current price (latest close) and day-over-day change straight from the arrays
+            current_price = float(closes[-1])
+            prev_close = float(closes[-2]) if closes.size > 1 else current_price
+            change_percent = (current_price / prev_close - 1.0) * 100.0 if closes.size > 1 else 0.0
             
             # Calculate moving averages
-            ma_20 = float(hist['Close'].rolling(window=20).mean().iloc[-1])
-            ma_50 = float(hist['Close'].rolling(window=50).mean().iloc[-1]) if len(hist) >= 50 else None
+            mas = compute_mas(closes, [20, 50])
             
-            # Get basic info
-            info = ticker.info
+            # Get basic info only when requested - ticker.info is a separate HTTP call
+            if fetch_info:
+                info = self._get_ticker_info(yahoo_symbol)
+                self.etf_names[symbol] = info.get('longName', symbol)
             
-            result = {
-                'symbol': symbol,
-                'yahoo_symbol': yahoo_symbol,
-                'current_price': round(current_price, 2),
-                'ma_20': round(ma_20, 2) if not pd.isna(ma_20) else None,
-                'ma_50': round(ma_50, 2) if ma_50 and not pd.isna(ma_50) else None,
-                'volume': int(hist['Volume'].iloc[-1]) if not pd.isna(hist['Volume'].iloc[-1]) else 0,
-                'prev_close': float(hist['Close'].iloc[-2]) if len(hist) > 1 else current_price,
-                'change_percent': 0,
-                'last_updated': datetime.now().isoformat(),
-                'data_source': 'yahoo_finance',
-                'name': info.get('longName', symbol)
-            }
+            return ETFQuote(
+                symbol=symbol,
+                yahoo_symbol=yahoo_symbol,
+                current_price=round(current_price, 2),
+                ma_20=mas['ma_20'],
+                ma_50=mas['ma_50'],
+                volume=int(np.nan_to_num(volumes[-1])),
+                prev_close=prev_close,
+                change_percent=round(change_percent, 2),
+                last_updated=datetime.now().isoformat(),
+                data_source='yahoo_finance',
+                name=self.etf_names.get(symbol, symbol)
+            )
             
-            # Calculate change percentage
-            if len(hist) > 1:
-                prev_close = float(hist['Close'].iloc[-2])
-                result['change_percent'] = round(((current_price - prev_close) / prev_close) * 100, 2)
+        except Exception as e:
+            logger.error("Error fetching Yahoo Finance data for %s: %s", symbol, e)
+            return None
+    
+    def fetch_last_and_ma20(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """
+        Lightweight quote for the scheduler: (last close, 20-day MA) from one month of bars
+        
+        Reads the chart JSON straight into arrays; pandas is only touched on the yfinance fallback.
+        """
+        try:
+            history = self._fetch_history_ndarray(self.to_yahoo_symbol(symbol), "1mo")
+            if history is None:
+                return None
             
-            return result
+            closes = history[0]
+            if closes.size < 20:
+                return None
             
+            return round(float(closes[-1]), 2), round(float(closes[-20:].mean()), 2)
+            
+        except Exception as e:
+            logger.error("Error fetching last price/20MA for %s: %s", symbol, e)
+            return None
+    
+    def fetch_daily_bars(self, symbol: str, period: str = "1mo") -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Daily (closes, volumes) for an NSE symbol - the same cached bars fetch_yahoo_finance_data works from"""
+        try:
+            return self._fetch_history_ndarray(self.to_yahoo_symbol(symbol), period)
         except Exception as e:
-            print(f"Error fetching Yahoo Finance data for {symbol}: {e}")
+            logger.error("Error fetching daily bars for %s: %s", symbol, e)
+            return None
+    
+    def _fetch_history_ndarray(self, yahoo_symbol: str, period: str = "1mo") -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Single network primitive for daily history: (closes, volumes) as float64 arrays
+        
+        Tries the raw chart JSON first and falls back to yfinance on error payloads.
+        """
+        cache_key = (yahoo_symbol, period)
+        cached = self._history_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self.PRICE_CACHE_TTL:
+            return cached[1]
+        
+        chart = self.fetch_yahoo_chart(yahoo_symbol, period)
+        if chart is not None:
+            history = (chart['close'], chart['volume'])
+        else:
+            hist = self._get_ticker(yahoo_symbol).history(period=period)
+            if hist.empty:
+                return None
+            history = (hist['Close'].to_numpy(dtype=np.float64), hist['Volume'].to_numpy(dtype=np.float64))
+        
+        self._history_cache[cache_key] = (time.monotonic(), history)
+        return history
+    
+    def fetch_history_bulk(self, symbols: List[str], period: str = "1mo",
+                           chunk_size: int = 10) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Daily (closes, volumes) for many symbols with one yf.download call per chunk
+        
+        Results also land in the history cache, so later per-symbol calls
+        (fetch_yahoo_finance_data, volume checks) are served from memory.
+        
+        Args:
+            symbols: NSE symbols to fetch
+            period: History period, must match the period the per-symbol callers use
+            chunk_size: Tickers per download request
+        
+        Returns:
+            Dictionary of NSE symbol -> (closes, volumes) for the symbols Yahoo returned
+        """
+        histories = {}
+        yahoo_to_nse = {self.to_yahoo_symbol(symbol): symbol for symbol in symbols}
+        yahoo_symbols = list(yahoo_to_nse)
+        
+        for start in range(0, len(yahoo_symbols), chunk_size):
+            chunk = yahoo_symbols[start:start + chunk_size]
+            try:
+                with self.limiter:
+                    data = yf.download(
+                        " ".join(chunk), period=period, interval="1d", group_by="ticker",
+                        auto_adjust=False, progress=False, threads=False, session=self.yf_session
+                    )
+            except Exception as e:
+                logger.error("Error downloading history for %s: %s", chunk, e)
+                continue
+            
+            if data is None or data.empty:
+                continue
+            
+            for yahoo_symbol in chunk:
+                if yahoo_symbol not in data.columns.get_level_values(0):
+                    continue
+                bars = data[yahoo_symbol].dropna(subset=['Close'])
+                if bars.empty:
+                    continue
+                history = (bars['Close'].to_numpy(dtype=np.float64), bars['Volume'].to_numpy(dtype=np.float64))
+                self._history_cache[(yahoo_symbol, period)] = (time.monotonic(), history)
+                histories[yahoo_to_nse[yahoo_symbol]] = history
+        
+        return histories
+    
+    def prefetch_history(self, symbols: List[str], period: str = "1mo", chunk_size: int = 10) -> int:
+        """Warm the daily-history cache for many symbols; returns how many were cached"""
+        return len(self.fetch_history_bulk(symbols, period, chunk_size))
+    
+    def _get_ticker(self, yahoo_symbol: str) -> yf.Ticker:
+        """Cached yf.Ticker for a symbol; least recently used entries are evicted"""
+        entry = self._ticker_cache.get(yahoo_symbol)
+        if entry is None:
+            entry = (yf.Ticker(yahoo_symbol, session=self.yf_session), 0.0, {})
+            self._ticker_cache[yahoo_symbol] = entry
+            if len(self._ticker_cache) > self.TICKER_CACHE_SIZE:
+                self._ticker_cache.popitem(last=False)
+        else:
+            self._ticker_cache.move_to_end(yahoo_symbol)
+        return entry[0]
+    
+    def _get_ticker_info(self, yahoo_symbol: str) -> Dict:
+        """ticker.info for a symbol, re-fetched only once INFO_CACHE_TTL has passed"""
+        ticker = self._get_ticker(yahoo_symbol)
+        _, fetched_at, info = self._ticker_cache[yahoo_symbol]
+        if not info or time.monotonic() - fetched_at > self.INFO_CACHE_TTL:
+            info = ticker.info
+            self._ticker_cache[yahoo_symbol] = (ticker, time.monotonic(), info)
+        return info
+    
+    def fetch_yahoo_chart(self, yahoo_symbol: str, period: str = "1mo") -> Optional[Dict[str, np.ndarray]]:
+        """
+        Fetch daily closes and volumes from Yahoo's v8 chart JSON endpoint
+        
+        Skips yfinance's timezone-aware index parsing and DataFrame construction.
+        
+        Args:
+            yahoo_symbol: Symbol in Yahoo Finance format (e.g. GOLDBEES.NS)
+            period: Chart range (1d, 5d, 1mo, 3mo, 6mo, 1y, ...)
+        
+        Returns:
+            Dictionary with 'close' and 'volume' float64 arrays, or None on error
+        """
+        try:
+            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{yahoo_symbol}"
+            response = self.session.get(url, params={'range': period, 'interval': '1d'}, timeout=10)
+            
+            if response.status_code != 200:
+                return None
+            
+            return self._parse_chart(response.content)
+            
+        except Exception:
+            return None
+    
+    def create_async_client(self, max_connections: int = 128, max_keepalive: int = 16) -> httpx.AsyncClient:
+        """Pooled keep-alive async client for chart requests; the caller must aclose() it"""
+        return httpx.AsyncClient(
+            headers={'User-Agent': self.session.headers['User-Agent']},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+            timeout=10
+        )
+    
+    async def fetch_yahoo_chart_async(self, client: httpx.AsyncClient, yahoo_symbol: str,
+                                      period: str = "1mo", retries: int = 3) -> Optional[Dict[str, np.ndarray]]:
+        """Async variant of fetch_yahoo_chart; backs off exponentially on 429/5xx"""
+        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{yahoo_symbol}"
+        for attempt in range(retries + 1):
+            try:
+                response = await client.get(url, params={'range': period, 'interval': '1d'})
+            except httpx.HTTPError:
+                response = None
+            
+            if response is not None and response.status_code == 200:
+                return self._parse_chart(response.content)
+            if response is not None and response.status_code != 429 and response.status_code < 500:
+                return None  # Not retryable
+            if attempt < retries:
+                await asyncio.sleep(0.5 * 2 ** attempt)
+        
+        return None
+    
+    @staticmethod
+    def _parse_chart(content: bytes) -> Optional[Dict[str, np.ndarray]]:
+        """Turn a v8 chart JSON payload into 'close'/'volume' float64 arrays (None on error payloads)"""
+        try:
+            chart = _json_loads(content).get('chart') or {}
+            if chart.get('error') or not chart.get('result'):
+                return None
+            
+            quote = chart['result'][0]['indicators']['quote'][0]
+            closes = np.asarray(quote.get('close') or [], dtype=np.float64)
+            volumes = np.asarray(quote.get('volume') or [], dtype=np.float64)
+            
+            if len(volumes) != len(closes):
+                volumes = np.full_like(closes, np.nan)
+            
+            # Drop bars without a close (holidays / partial sessions come back as null)
+            valid = ~np.isnan(closes)
+            if not valid.any():
+                return None
+            
+            return {'close': closes[valid], 'volume': volumes[valid]}
+            
+        except Exception:
             return None
     
     def fetch_nse_data(self, symbol: str) -> Optional[Dict]:
@@ -129,7 +516,7 @@ class PriceFetcher:
             response = self.session.get(url, headers=headers, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 
                 if 'priceInfo' in data:
                     price_info = data['priceInfo']
@@ -150,7 +537,7 @@ class PriceFetcher:
             return None
             
         except Exception as e:
-            print(f"Error fetching NSE data for {symbol}: {e}")
+            logger.error("Error fetching NSE data for %s: %s", symbol, e)
             return None
     
     def fetch_historical_data(self, symbol: str, start_date: str, end_date: str = None) -> Optional[pd.DataFrame]:
@@ -169,65 +556,136 @@ class PriceFetcher:
             if end_date is None:
                 end_date = datetime.now().strftime('%Y-%m-%d')
             
-            # Use Yahoo Finance for historical data
-            yahoo_symbol = self.nse_to_yahoo_mapping.get(symbol, f"{symbol}.NS")
+            # Serve what we can from the local parquet cache and only download the gap
+            start = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+            cached = self._load_cache(symbol)
+            
+            # Nothing trades before the listing date - clamp so a young ETF's cache can still cover the request
+            listed = self._listing_date(symbol)
+            if listed is not None and listed > start:
+                start = listed
             
-            ticker = yf.Ticker(yahoo_symbol)
-            hist = ticker.history(start=start_date, end=end_date)
+            # A start on a weekend/holiday has no bar of its own - the next trading day covers it
+            if (cached is not None and not cached.empty
+                    and np.busday_count(start, cached.index.min().date()) <= self.CACHE_START_SLACK_DAYS):
+                hist = cached
+                # Re-fetch the last cached day too, it may have been a partial session
+                fetch_start = cached.index.max().date()
+                
+                if fetch_start < end and not self._cache_is_fresh(symbol):
+                    gap = self._get_ticker(self.to_yahoo_symbol(symbol)).history(
+                        start=fetch_start.strftime('%Y-%m-%d'), end=end_date
+                    )
+                    if not gap.empty:
+                        hist = pd.concat([cached, gap])
+                        hist = hist[~hist.index.duplicated(keep='last')]
+                    self._save_cache(symbol, hist)
+            else:
+                # Use Yahoo Finance for historical data
+                hist = self._get_ticker(self.to_yahoo_symbol(symbol)).history(start=start.strftime('%Y-%m-%d'), end=end_date)
+                if not hist.empty:
+                    self._save_cache(symbol, hist)
+                    # A full download that starts well after the requested date has found the listing date
+                    first_bar = hist.index.min().date()
+                    if (first_bar - start).days > self.LISTING_GAP_DAYS:
+                        self._record_listing_date(symbol, first_bar)
+            
+            bar_dates = np.array(hist.index.date)
+            hist = hist[(bar_dates >= start) & (bar_dates < end)].copy()
             
             if not hist.empty:
                 # Calculate moving averages
-                hist['MA_5'] = hist['Close'].rolling(window=5).mean()
-                hist['MA_10'] = hist['Close'].rolling(window=10).mean()
-                hist['MA_20'] = hist['Close'].rolling(window=20).mean()
-                hist['MA_50'] = hist['Close'].rolling(window=50).mean()
+                closes = hist['Close'].to_numpy(dtype=np.float64)
+                for window in (5, 10, 20, 50):
+                    hist[f'MA_{window}'] = move_mean(closes, window)
                 
                 return hist
             
             return None
             
         except Exception as e:
-            print(f"Error fetching historical data for {symbol}: {e}")
+            logger.error("Error fetching historical data for %s: %s", symbol, e)
+            return None
+    
+    def _cache_path(self, symbol: str) -> str:
+        return os.path.join(self.history_cache_dir, f"{symbol}.parquet")
+    
+    def _cache_is_fresh(self, symbol: str) -> bool:
+        """Secondary freshness check: cache file written within HISTORY_CACHE_TTL"""
+        try:
+            return time.time() - os.path.getmtime(self._cache_path(symbol)) < self.HISTORY_CACHE_TTL
+        except OSError:
+            return False
+    
+    def _load_cache(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Load cached daily history for a symbol (None if missing or unreadable)"""
+        try:
+            return pd.read_parquet(self._cache_path(symbol))
+        except Exception:
             return None
     
-    def calculate_moving_averages(self, symbol: str, periods: List[int] = [20, 50]) -> Dict:
+    def _listing_date(self, symbol: str) -> Optional[date]:
+        """First traded day recorded for a symbol, if a download has revealed one"""
+        if self._listing_dates is None:
+            try:
+                with open(os.path.join(self.history_cache_dir, "listing_dates.json"), 'rb') as f:
+                    self._listing_dates = _json_loads(f.read())
+            except (OSError, ValueError):
+                self._listing_dates = {}
+        
+        listed = self._listing_dates.get(symbol)
+        return date.fromisoformat(listed) if listed else None
+    
+    def _record_listing_date(self, symbol: str, listed: date):
+        """Remember a symbol's first traded day across runs"""
+        self._listing_date(symbol)  # Make sure the existing file is loaded before rewriting it
+        self._listing_dates[symbol] = listed.isoformat()
+        path = os.path.join(self.history_cache_dir, "listing_dates.json")
+        try:
+            os.makedirs(self.history_cache_dir, exist_ok=True)
+            with open(f"{path}.tmp", 'w') as f:
+                json.dump(self._listing_dates, f, indent=2)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.debug("Could not write listing dates: %s", e)
+    
+    def _save_cache(self, symbol: str, df: pd.DataFrame):
+        """Persist daily history for a symbol; caching is skipped if pyarrow is unavailable"""
+        try:
+            os.makedirs(self.history_cache_dir, exist_ok=True)
+            df.to_parquet(self._cache_path(symbol))
+        except Exception as e:
+            logger.debug("Could not write history cache for %s: %s", symbol, e)
+    
+    def calculate_moving_averages(self, symbol: str, periods: List[int] = [20, 50],
+                                  closes: np.ndarray = None) -> Dict:
         """
         Calculate moving averages for the given periods
         
         Args:
             symbol: ETF symbol
             periods: List of periods for moving averages (default: [20, 50])
+            closes: Daily closes the caller already has; skips the network fetch
         
         Returns:
             Dictionary with moving averages
         """
         try:
-            # Get 60 days of data to ensure we have enough for 50-day MA
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=80)  # Extra buffer
-            
-            hist_data = self.fetch_historical_data(
-                symbol, 
-                start_date.strftime('%Y-%m-%d'),
-                end_date.strftime('%Y-%m-%d')
-            )
-            
-            if hist_data is None or hist_data.empty:
-                return {}
+            if closes is None:
+                # ~3 months of bars is enough for the 50-day MA
+                history = self._fetch_history_ndarray(self.to_yahoo_symbol(symbol), "3mo")
+                if history is None:
+                    return {}
+                closes = history[0]
             
-            result = {}
-            for period in periods:
-                if len(hist_data) >= period:
-                    ma_value = hist_data['Close'].rolling(window=period).mean().iloc[-1]
-                    result[f'ma_{period}'] = round(float(ma_value), 2) if not pd.isna(ma_value) else None
-            
-            return result
+            return compute_mas(closes, periods)
             
         except Exception as e:
-            print(f"Error calculating moving averages for {symbol}: {e}")
+            logger.error("Error calculating moving averages for %s: %s", symbol, e)
             return {}
     
-    def fetch_multiple_etfs(self, etf_list: List[str], source: str = "yahoo") -> Dict[str, Dict]:
+    def fetch_multiple_etfs(self, etf_list: List[str], source: str = "yahoo") -> Dict[str, Union[ETFQuote, Dict]]:
         """
         Fetch data for multiple ETFs
         
@@ -241,23 +699,23 @@ class PriceFetcher:
         results = {}
         
         for i, symbol in enumerate(etf_list):
-            print(f"Processing {i+1}/{len(etf_list)}: {symbol}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Processing %d/%d: %s", i + 1, len(etf_list), symbol)
             
-            if source == "yahoo":
-                data = self.fetch_yahoo_finance_data(symbol)
-            elif source == "nse":
-                data = self.fetch_nse_data(symbol)
-            else:
-                # Try Yahoo first, fallback to NSE
-                data = self.fetch_yahoo_finance_data(symbol)
-                if data is None:
+            # Rate limiting to avoid being blocked
+            with self.limiter:
+                if source == "yahoo":
+                    data = self.fetch_yahoo_finance_data(symbol, fetch_info=False)
+                elif source == "nse":
                     data = self.fetch_nse_data(symbol)
+                else:
+                    # Try Yahoo first, fallback to NSE
+                    data = self.fetch_yahoo_finance_data(symbol, fetch_info=False)
+                    if data is None:
+                        data = self.fetch_nse_data(symbol)
             
             if data:
                 results[symbol] = data
-            
-            # Rate limiting to avoid being blocked
-            time.sleep(1)
         
         return results
     
@@ -276,23 +734,38 @@ class PriceFetcher:
             Dictionary with ETF data
         """
         try:
-            df = pd.read_csv(csv_file)
-            results = {}
+            # Only parse the columns we use; broker exports can be very wide
+            header = pd.read_csv(csv_file, nrows=0).columns
+            usecols = [col for col in (symbol_col, price_col, volume_col) if col in header]
+            dtype = {price_col: np.float64}
+            if volume_col in usecols:
+                dtype[volume_col] = np.float64  # float so blank volumes survive as NaN
             
-            for _, row in df.iterrows():
-                symbol = str(row[symbol_col]).strip()
-                current_price = float(row[price_col])
-                volume = int(row.get(volume_col, 0)) if volume_col in row else 0
-                
-                # Calculate moving averages
-                ma_data = self.calculate_moving_averages(symbol)
-                
+            try:
+                df = pd.read_csv(csv_file, usecols=usecols, dtype=dtype, engine="pyarrow")
+            except ImportError:
+                df = pd.read_csv(csv_file, usecols=usecols, dtype=dtype, engine="c")
+            
+            symbols = [str(raw_symbol).strip() for raw_symbol in df[symbol_col]]
+            prices = df[price_col].to_numpy(dtype=np.float64)
+            volumes = df[volume_col].to_numpy(dtype=np.float64) if volume_col in df.columns else np.zeros(len(df))
+            
+            # Calculate moving averages, one worker process per core for larger files
+            if len(symbols) > 1:
+                processes = min(os.cpu_count() or 1, len(symbols))
+                with mp.Pool(processes=processes, initializer=_init_ma_worker) as pool:
+                    ma_list = pool.map(_worker_moving_averages, symbols)
+            else:
+                ma_list = [self.calculate_moving_averages(symbol) for symbol in symbols]
+            
+            results = {}
+            for symbol, current_price, raw_volume, ma_data in zip(symbols, prices, volumes, ma_list):
                 results[symbol] = {
                     'symbol': symbol,
-                    'current_price': current_price,
+                    'current_price': float(current_price),
                     'ma_20': ma_data.get('ma_20'),
                     'ma_50': ma_data.get('ma_50'),
-                    'volume': volume,
+                    'volume': int(np.nan_to_num(raw_volume)),
                     'last_updated': datetime.now().isoformat(),
                     'data_source': 'csv_import'
                 }
@@ -300,21 +773,21 @@ class PriceFetcher:
             return results
             
         except Exception as e:
-            print(f"Error importing from CSV: {e}")
+            logger.error("Error importing from CSV: %s", e)
             return {}
     
     def get_etf_info(self, symbol: str) -> Optional[Dict]:
         """
-        Get detailed ETF information
+        Get detailed ETF information (use this when name/sector are needed)
         """
         try:
-            yahoo_symbol = self.nse_to_yahoo_mapping.get(symbol, f"{symbol}.NS")
-            ticker = yf.Ticker(yahoo_symbol)
-            info = ticker.info
+            yahoo_symbol = self.to_yahoo_symbol(symbol)
+            info = self._get_ticker_info(yahoo_symbol)
+            self.etf_names[symbol] = info.get('longName', symbol)
             
             return {
                 'symbol': symbol,
-                'name': info.get('longName', symbol),
+                'name': self.etf_names[symbol],
                 'sector': info.get('sector', 'N/A'),
                 'category': info.get('category', 'ETF'),
                 'expense_ratio': info.get('annualReportExpenseRatio', 'N/A'),
@@ -324,10 +797,23 @@ class PriceFetcher:
             }
             
         except Exception as e:
-            print(f"Error fetching ETF info for {symbol}: {e}")
+            logger.error("Error fetching ETF info for %s: %s", symbol, e)
             return None
 
 
+# Per-process fetcher for CSV import workers (sessions and locks don't pickle)
+_worker_fetcher = None
+
+
+def _init_ma_worker():
+    global _worker_fetcher
+    _worker_fetcher = PriceFetcher()
+
+
+def _worker_moving_averages(symbol: str) -> Dict:
+    return _worker_fetcher.calculate_moving_averages(symbol)
+
+
 class PriceUpdateScheduler:
     """Scheduler for automatic price updates"""
     
@@ -335,6 +821,8 @@ class PriceUpdateScheduler:
         self.data_manager = data_manager
         self.price_fetcher = price_fetcher
         self.is_running = False
+        self.update_times = ("09:35", "12:00", "15:25")
+        self.last_run_slot = None
     
     def update_all_etf_prices(self, etf_list: List[str] = None):
         """Update prices for all ETFs in the portfolio"""
@@ -343,58 +831,179 @@ class PriceUpdateScheduler:
                 etf_list = list(self.data_manager.data["etfs"].keys())
             
             if not etf_list:
-                print("No ETFs found to update")
+                logger.info("No ETFs found to update")
                 return
             
-            print(f"Updating prices for {len(etf_list)} ETFs...")
-            
-            # Fetch data from Yahoo Finance
-            price_data = self.price_fetcher.fetch_multiple_etfs(etf_list, source="yahoo")
+            logger.info("Updating prices for %d ETFs...", len(etf_list))
             
+            # Fetch only the last close and 20-day MA from Yahoo Finance
             updated_count = 0
-            for symbol, data in price_data.items():
-                if data and data.get('current_price') and data.get('ma_20'):
-                    self.data_manager.update_etf_price(
-                        symbol, 
-                        data['current_price'], 
-                        data['ma_20']
-                    )
+            for symbol in etf_list:
+                with self.price_fetcher.limiter:
+                    quote = self.price_fetcher.fetch_last_and_ma20(symbol)
+                
+                if quote:
+                    current_price, ma_20 = quote
+                    self.data_manager.update_etf_price(symbol, current_price, ma_20)
                     updated_count += 1
-                    print(f"✅ Updated {symbol}: ₹{data['current_price']:.2f} (20MA: ₹{data['ma_20']:.2f})")
+                    logger.info("✅ Updated %s: ₹%.2f (20MA: ₹%.2f)", symbol, current_price, ma_20)
             
-            print(f"\n🎉 Successfully updated {updated_count} ETFs!")
+            logger.info("🎉 Successfully updated %d ETFs!", updated_count)
             return updated_count
             
         except Exception as e:
-            print(f"Error updating ETF prices: {e}")
+            logger.error("Error updating ETF prices: %s", e)
             return 0
     
-    def schedule_regular_updates(self):
-        """Schedule regular price updates (requires manual triggering for now)"""
-        import schedule
+    async def fetch_all_etf_quotes_async(self, etf_list: List[str] = None, progress=None,
+                                         progress_every: int = 25,
+                                         max_concurrency: int = 64) -> List[Tuple[str, float, float]]:
+        """
+        Concurrently fetch the latest close and 20-day MA for many ETFs without touching the store
         
-        # Schedule updates during market hours (9:30 AM to 3:30 PM IST)
-        schedule.every().monday.at("09:35").do(self.update_all_etf_prices)
-        schedule.every().monday.at("12:00").do(self.update_all_etf_prices)
-        schedule.every().monday.at("15:25").do(self.update_all_etf_prices)
-        
-        # Add for other weekdays
-        for day in ['tuesday', 'wednesday', 'thursday', 'friday']:
-            getattr(schedule.every(), day).at("09:35").do(self.update_all_etf_prices)
-            getattr(schedule.every(), day).at("12:00").do(self.update_all_etf_prices)
-            getattr(schedule.every(), day).at("15:25").do(self.update_all_etf_prices)
-        
-        print("📅 Price update schedule configured:")
-        print("   - Market open: 9:35 AM")
-        print("   - Mid-day: 12:00 PM") 
-        print("   - Market close: 3:25 PM")
-        print("   - Monday to Friday only")
+        Args:
+            etf_list: Symbols to fetch (defaults to every ETF in the store)
+            progress: Optional coroutine function called as progress(done, total)
+            progress_every: Call progress after this many completed fetches
+            max_concurrency: Upper bound on in-flight Yahoo requests
         
+        Returns:
+            (symbol, current_price, ma_20) rows for the ETFs Yahoo returned enough bars for
+        """
+        if etf_list is None:
+            etf_list = list(self.data_manager.data["etfs"].keys())
+        
+        if not etf_list:
+            logger.info("No ETFs found to update")
+            return []
+        
+        logger.info("Fetching prices for %d ETFs (up to %d concurrent)...", len(etf_list), max_concurrency)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        fetcher = self.price_fetcher
+        
+        async def fetch_one(client: httpx.AsyncClient, symbol: str):
+            async with semaphore:
+                chart = await fetcher.fetch_yahoo_chart_async(client, fetcher.to_yahoo_symbol(symbol))
+            
+            if chart is None:
+                # Chart endpoint refused - fall back to the blocking yfinance path off-loop
+                return symbol, await asyncio.to_thread(fetcher.fetch_last_and_ma20, symbol)
+            
+            closes = chart['close']
+            if closes.size < 20:
+                return symbol, None
+            return symbol, (round(float(closes[-1]), 2), round(float(closes[-20:].mean()), 2))
+        
+        rows = []
+        done = 0
+        # Reuse the long-lived pooled client when the host app provided one
+        client = fetcher.async_client
+        owns_client = client is None
+        if owns_client:
+            client = fetcher.create_async_client(max_connections=max_concurrency)
+        
+        try:
+            for future in asyncio.as_completed([fetch_one(client, symbol) for symbol in etf_list]):
+                symbol, quote = await future
+                done += 1
+                
+                if quote:
+                    current_price, ma_20 = quote
+                    rows.append((symbol, current_price, ma_20))
+                    logger.info("✅ Fetched %s: ₹%.2f (20MA: ₹%.2f)", symbol, current_price, ma_20)
+                
+                if progress is not None and done % progress_every == 0 and done < len(etf_list):
+                    await progress(done, len(etf_list))
+        finally:
+            if owns_client:
+                await client.aclose()
+        
+        return rows
+    
+    async def update_all_etf_prices_async(self, etf_list: List[str] = None, progress=None,
+                                          progress_every: int = 25, max_concurrency: int = 64) -> int:
+        """
+        Concurrent version of update_all_etf_prices for use inside an event loop
+        
+        Args:
+            etf_list: Symbols to update (defaults to every ETF in the store)
+            progress: Optional coroutine function called as progress(done, total)
+            progress_every: Call progress after this many completed fetches
+            max_concurrency: Upper bound on in-flight Yahoo requests
+        
+        Returns:
+            Number of ETFs updated
+        """
+        rows = await self.fetch_all_etf_quotes_async(etf_list, progress, progress_every, max_concurrency)
+        
+        # Applying the rows and writing the store is blocking work - keep it off the event loop
+        updated_count = await asyncio.to_thread(self.data_manager.update_etf_prices_bulk, rows)
+        
+        logger.info("🎉 Successfully updated %d ETFs!", updated_count)
+        return updated_count
+    
+    def _due_slot(self, now: datetime) -> Optional[str]:
+        """Latest of today's update slots that has passed but not run yet ("YYYY-MM-DD HH:MM"), Mon-Fri only"""
+        if now.weekday() >= 5:
+            return None
+        
+        today, clock = now.strftime("%Y-%m-%d"), now.strftime("%H:%M")
+        passed = [f"{today} {slot}" for slot in sorted(self.update_times) if slot <= clock]
+        if not passed or passed[-1] <= (self.last_run_slot or ""):
+            return None
+        return passed[-1]
+    
+    def _due_jobs(self, now: datetime) -> List:
+        """Coroutines for any update slot that is due (one update covers several overdue slots)"""
+        slot = self._due_slot(now)
+        if slot is None:
+            return []
+        
+        self.last_run_slot = slot
+        return [asyncio.to_thread(self.update_all_etf_prices)]
+    
+    def _next_slot_at(self, now: datetime) -> datetime:
+        """Datetime of the next weekday update slot strictly after now"""
+        for days_ahead in range(8):
+            day = now + timedelta(days=days_ahead)
+            if day.weekday() >= 5:
+                continue
+            for slot in sorted(self.update_times):
+                hour, minute = map(int, slot.split(":"))
+                slot_at = day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+                if slot_at > now:
+                    return slot_at
+        return now + timedelta(days=1)
+    
+    async def run_scheduler(self):
+        """Async scheduler loop; blocking updates run in a worker thread"""
         self.is_running = True
         
+        # Like the schedule library: slots already past when we start are not run retroactively
+        if self.last_run_slot is None:
+            self.last_run_slot = self._due_slot(datetime.now())
+        
         while self.is_running:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            pending = self._due_jobs(datetime.now())
+            if pending:
+                await asyncio.gather(*pending)
+            
+            # Sleep until the next slot instead of polling, so a slow update or timer drift can't skip one;
+            # a slot that still gets overshot is picked up by _due_jobs on the next pass
+            now = datetime.now()
+            await asyncio.sleep(max((self._next_slot_at(now) - now).total_seconds(), 1))
+    
+    def schedule_regular_updates(self):
+        """Schedule regular price updates (requires manual triggering for now)"""
+        # Schedule updates during market hours (9:30 AM to 3:30 PM IST)
+        logger.info("📅 Price update schedule configured:")
+        logger.info("   - Market open: 9:35 AM")
+        logger.info("   - Mid-day: 12:00 PM")
+        logger.info("   - Market close: 3:25 PM")
+        logger.info("   - Monday to Friday only")
+        
+        asyncio.run(self.run_scheduler())
 
 
 def demo_price_fetching():
@@ -414,10 +1023,10 @@ def demo_price_fetching():
         data = fetcher.fetch_yahoo_finance_data(etf)
         if data:
             print(f"✅ {etf}:")
-            print(f"   Current Price: ₹{data['current_price']}")
-            print(f"   20-day MA: ₹{data['ma_20']}")
-            print(f"   Volume: {data['volume']:,}")
-            print(f"   Change: {data['change_percent']:.2f}%")
+            print(f"   Current Price: ₹{data.current_price}")
+            print(f"   20-day MA: ₹{data.ma_20}")
+            print(f"   Volume: {data.volume:,}")
+            print(f"   Change: {data.change_percent:.2f}%")
         else:
             print(f"❌ Failed to fetch data for {etf}")
         print()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Session Store - Per-user conversation state and short-lived result cache for the Telegram bot
+Redis-backed when available, with an in-process TTL fallback
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+SESSION_TTL = 1800  # seconds
+SESSION_CAP = 10000  # in-process sessions kept before evicting the least recently used
+RESULT_CACHE_TTL = 300  # seconds
+
+class RedisSessionStorage:
+    """Stores sessions as JSON under session:<user_id> with a native Redis TTL"""
+    
+    def __init__(self, redis_client, prefix: str = "session:", ttl: int = SESSION_TTL):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl = ttl
+    
+    async def get(self, user_id: int) -> Optional[Dict]:
+        """Return the user's session, or None if missing/expired"""
+        payload = await self.redis.get(f"{self.prefix}{user_id}")
+        return json.loads(payload) if payload is not None else None
+    
+    async def set(self, user_id: int, session: Dict, ex: int = None):
+        """Store the user's session, resetting its expiry"""
+        await self.redis.set(f"{self.prefix}{user_id}", json.dumps(session, default=str), ex=ex or self.ttl)
+    
+    async def delete(self, user_id: int):
+        """Forget the user's session"""
+        await self.redis.delete(f"{self.prefix}{user_id}")
+    
+    def purge_expired(self) -> int:
+        """Redis expires keys itself - nothing to do"""
+        return 0
+
+class MemorySessionStorage:
+    """In-process fallback with the same API; bounded by TTL and an LRU cap"""
+    
+    def __init__(self, ttl: int = SESSION_TTL, max_sessions: int = SESSION_CAP):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[int, tuple]" = OrderedDict()  # user_id -> (expires_at, session), LRU order
+    
+    async def get(self, user_id: int) -> Optional[Dict]:
+        """Return the user's session, or None if missing/expired"""
+        entry = self._sessions.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._sessions[user_id]
+            return None
+        self._sessions.move_to_end(user_id)
+        return entry[1]
+    
+    async def set(self, user_id: int, session: Dict, ex: int = None):
+        """Store the user's session, resetting its expiry"""
+        self._sessions[user_id] = (time.monotonic() + (ex or self.ttl), session)
+        self._sessions.move_to_end(user_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+    
+    async def delete(self, user_id: int):
+        """Forget the user's session"""
+        self._sessions.pop(user_id, None)
+    
+    def purge_expired(self) -> int:
+        """Evict sessions past their TTL; returns how many were dropped"""
+        now = time.monotonic()
+        expired = [uid for uid, (expires_at, _) in self._sessions.items() if expires_at < now]
+        for user_id in expired:
+            del self._sessions[user_id]
+        return len(expired)
+
+def create_session_storage(redis_url: str = None, ttl: int = SESSION_TTL):
+    """Redis-backed storage when a URL is configured and redis is installed, else in-process"""
+    if redis_url and aioredis is not None:
+        return RedisSessionStorage(aioredis.from_url(redis_url), ttl=ttl)
+    return MemorySessionStorage(ttl=ttl)
+
+
+class ResultCache:
+    """
+    Short-TTL cache for computed bot views (recommendations, rankings, portfolio)
+    
+    Values go through JSON so Redis and in-memory backends behave the same
+    (tuples come back as lists).
+    """
+    
+    def __init__(self, redis_client=None, prefix: str = "cache:", ttl: int = RESULT_CACHE_TTL):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl = ttl
+        self._entries: Dict[str, tuple] = {}  # key -> (expires_at, payload) when Redis is off
+    
+    async def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: int = None) -> Any:
+        """Return the cached value for key, computing and storing it on a miss"""
+        payload = await self._get(key)
+        if payload is not None:
+            return json.loads(payload)
+        
+        value = compute()
+        payload = json.dumps(value, default=str)
+        await self._set(key, payload, ttl or self.ttl)
+        return json.loads(payload)
+    
+    async def invalidate(self, *keys: str):
+        """Drop cached values after the underlying data changed"""
+        if self.redis is not None:
+            await self.redis.delete(*(f"{self.prefix}{key}" for key in keys))
+        else:
+            for key in keys:
+                self._entries.pop(key, None)
+    
+    async def _get(self, key: str) -> Optional[str]:
+        if self.redis is not None:
+            return await self.redis.get(f"{self.prefix}{key}")
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+    
+    async def _set(self, key: str, payload: str, ttl: int):
+        if self.redis is not None:
+            await self.redis.set(f"{self.prefix}{key}", payload, ex=ttl)
+        else:
+            self._entries[key] = (time.monotonic() + ttl, payload)
+
+def create_result_cache(redis_url: str = None, ttl: int = RESULT_CACHE_TTL) -> ResultCache:
+    """Redis-backed result cache when a URL is configured and redis is installed, else in-process"""
+    if redis_url and aioredis is not None:
+        return ResultCache(aioredis.from_url(redis_url), ttl=ttl)
+    return ResultCache(ttl=ttl)
@@ -16,9 +16,9 @@ def run_command(command):
         return False, e.stderr
 
 def check_python_version():
-    """Check if Python version is 3.7 or higher"""
-    if sys.version_info < (3, 7):
-        print("❌ Python 3.7 or higher is required!")
+    """Check if Python version is 3.10 or higher (slotted dataclasses need 3.10)"""
+    if sys.version_info < (3, 10):
+        print("❌ Python 3.10 or higher is required!")
         print(f"Current version: {sys.version}")
         return False
     print(f"✅ Python version: {sys.version}")
@@ -43,7 +43,8 @@ def setup_virtual_environment():
         "pandas>=1.3.0",
         "openpyxl>=3.0.0", 
         "python-telegram-bot>=20.0",
-        "requests>=2.25.0"
+        "requests>=2.25.0",
+        "orjson>=3.9.0"
     ]
     
     pip_command = "source etf_trading_env/bin/activate && pip install " + " ".join(packages)
@@ -56,6 +57,21 @@ def setup_virtual_environment():
     print("✅ All packages installed successfully!")
     return True
 
+def compile_native_modules():
+    """Optionally compile the pure sync-planning module with mypyc (falls back to plain Python)"""
+    print("\n⚙️ Compiling etf_sync with mypyc (optional)...")
+    
+    compile_command = ("source etf_trading_env/bin/activate && pip install mypy "
+                       "&& mypyc --ignore-missing-imports etf_sync.py")
+    success, output = run_command(compile_command)
+    
+    if not success:
+        print(f"⚠️ mypyc build skipped, using interpreted etf_sync: {output}")
+        return False
+    
+    print("✅ etf_sync compiled successfully!")
+    return True
+
 def create_sample_config():
     """Create sample configuration files"""
     print("\n📝 Creating sample configuration...")
@@ -71,6 +87,14 @@ BOT_TOKEN = "YOUR_BOT_TOKEN_HERE"
 # 2. Send /start and then /newbot
 # 3. Follow the instructions to create your bot
 # 4. Copy the token and replace the value above
+
+# Optional webhook mode - public HTTPS base URL that forwards to PORT on this machine
+# Leave WEBHOOK_URL as None to use long polling instead
+WEBHOOK_URL = None
+PORT = 8443
+
+# Optional Redis for user sessions - leave as None to keep sessions in memory
+REDIS_URL = None
 '''
     
     try:
@@ -146,6 +170,9 @@ def main():
     if not setup_virtual_environment():
         sys.exit(1)
     
+    # Optional AOT build of the sync planner - never fatal
+    compile_native_modules()
+    
     # Create sample configuration
     if not create_sample_config():
         sys.exit(1)
@@ -5,10 +5,42 @@ Automatically sync ETF names from Excel file
 """
 
 import sys
+from typing import Tuple
 from etf_symbol_updater import ETFSymbolUpdater
-from etf_data_manager import ETFDataManager
+from etf_data_manager import ETFDataManager, canonical_etf_name
+from etf_sync import SyncPlan, compute_sync_plan, format_rename_preview
 
-def auto_sync_from_excel():
+def apply_sync_plan(data_manager: ETFDataManager, updater: ETFSymbolUpdater, plan: SyncPlan) -> Tuple[int, str]:
+    """Apply renames and additions from a SyncPlan; returns (success_count, backup_file)"""
+    backup_file = None
+    success_count = 0
+    
+    touched_files = updater.plan_files(plan)
+    
+    if touched_files:
+        # Create backup first - only the files this plan rewrites
+        backup_file = updater.create_incremental_backup(touched_files)
+        print(f"📋 Backup created: {backup_file}")
+    
+    if plan.renames:
+        # Perform updates (one save for the whole batch)
+        rename_results = updater.update_etf_symbols(plan.renames)
+        
+        for old_etf, new_etf in plan.renames:
+            if rename_results[old_etf]:
+                print(f"   ✅ Successfully updated {old_etf} → {new_etf}")
+                success_count += 1
+            else:
+                print(f"   ❌ Failed to update {old_etf} → {new_etf}")
+    
+    # Add any completely new ETFs
+    for etf in data_manager.add_etfs(plan.adds):
+        print(f"   + Added {etf}")
+        success_count += 1
+    
+    return success_count, backup_file
+
+def auto_sync_from_excel(auto_confirm: bool = False):
     print("🔄 Auto-Syncing ETF Names from Excel File")
     print("=" * 45)
     
@@ -18,13 +50,14 @@ def auto_sync_from_excel():
         updater = ETFSymbolUpdater(data_manager)
         
         print("📊 Loading current ETF data...")
-        current_etfs = set(data_manager.data["etfs"].keys())
+        # Diff in canonical form on both sides; map back to the stored keys when renaming
+        stored_names = {canonical_etf_name(etf): etf for etf in data_manager.data["etfs"]}
+        current_etfs = stored_names.keys()
         print(f"   Current ETFs in system: {len(current_etfs)}")
         
         print("📋 Loading ETF names from Excel...")
         try:
-            excel_etfs = data_manager.load_etf_list_from_excel("etf-list.xlsx")
-            excel_etf_set = set(excel_etfs)
+            excel_etfs = frozenset(data_manager.stream_etf_list_from_excel("etf-list.xlsx"))
             print(f"   ETFs in Excel file: {len(excel_etfs)}")
         except Exception as e:
             print(f"❌ Error loading Excel file: {e}")
@@ -33,114 +66,74 @@ def auto_sync_from_excel():
         
         print("\n🔍 Detecting Changes...")
         
-        # Find differences
-        only_in_current = current_etfs - excel_etf_set
-        only_in_excel = excel_etf_set - current_etfs
-        common_etfs = current_etfs & excel_etf_set
+        plan = compute_sync_plan(current_etfs, excel_etfs)
+        plan.renames = [(stored_names[old_etf], new_etf) for old_etf, new_etf in plan.renames]
+        only_in_current, only_in_excel = plan.only_in_current, plan.only_in_excel
+        
+        if not only_in_current and not only_in_excel:
+            print("✅ No changes needed - Excel and system are in sync!")
+            return True
         
-        print(f"   ETFs in both: {len(common_etfs)}")
+        print(f"   ETFs in both: {len(plan.common)}")
         print(f"   Only in current system: {len(only_in_current)}")
         print(f"   Only in Excel (new/renamed): {len(only_in_excel)}")
         
         if only_in_current:
             print(f"\n📤 ETFs to be removed/renamed:")
-            for etf in sorted(only_in_current):
+            for etf in only_in_current:
                 print(f"   - {etf}")
         
         if only_in_excel:
             print(f"\n📥 New ETFs in Excel:")
-            for etf in sorted(only_in_excel):
+            for etf in only_in_excel:
                 print(f"   + {etf}")
         
         # Detect potential renames (when counts are similar)
-        if len(only_in_current) > 0 and len(only_in_excel) > 0:
+        if plan.renames:
             print(f"\n🔄 Potential ETF Name Changes Detected!")
             print(f"   This could be ETF renames: {len(only_in_current)} old → {len(only_in_excel)} new")
             
-            old_etfs = sorted(only_in_current)
-            new_etfs = sorted(only_in_excel)
+            # Build the whole preview and write it once instead of one print per line
+            sys.stdout.write(format_rename_preview(plan))
             
-            print(f"\n🤔 Possible mappings:")
-            for i, old_etf in enumerate(old_etfs):
-                if i < len(new_etfs):
-                    new_etf = new_etfs[i]
-                    print(f"   {old_etf} → {new_etf}?")
-                else:
-                    print(f"   {old_etf} → [to be removed]")
+            # Get user confirmation
+            if not auto_confirm:
+                confirm = input(f"\n✅ Proceed with these changes? (y/n): ").lower().strip()
+                if confirm != 'y':
+                    print("❌ Update cancelled by user")
+                    return False
             
-            print(f"\n❓ Do you want to proceed with automatic name updates?")
-            print(f"   This will:")
-            for i, old_etf in enumerate(old_etfs):
-                if i < len(new_etfs):
-                    new_etf = new_etfs[i]
-                    print(f"   • Rename {old_etf} to {new_etf}")
-                    print(f"     - Preserve all price data and volume info")
-                    print(f"     - Update portfolio holdings")
-                    print(f"     - Update transaction history")
-                else:
-                    print(f"   • Remove {old_etf} (no new name found)")
+            print(f"\n🔄 Executing ETF name updates...")
+            success_count, backup_file = apply_sync_plan(data_manager, updater, plan)
             
-            # Get user confirmation
-            confirm = input(f"\n✅ Proceed with these changes? (y/n): ").lower().strip()
+            print(f"\n🎉 Update Complete!")
+            print(f"   Successfully updated: {success_count} ETFs")
+            print(f"   Backup file: {backup_file}")
             
-            if confirm == 'y':
-                print(f"\n🔄 Executing ETF name updates...")
-                
-                # Create backup first
-                backup_file = updater.create_backup()
-                print(f"📋 Backup created: {backup_file}")
-                
-                # Perform updates
-                success_count = 0
-                for i, old_etf in enumerate(old_etfs):
-                    if i < len(new_etfs):
-                        new_etf = new_etfs[i]
-                        print(f"\n   Updating {old_etf} → {new_etf}...")
-                        
-                        success = updater.update_etf_symbol(old_etf, new_etf)
-                        if success:
-                            print(f"   ✅ Successfully updated {old_etf} → {new_etf}")
-                            success_count += 1
-                        else:
-                            print(f"   ❌ Failed to update {old_etf} → {new_etf}")
-                
-                # Add any completely new ETFs
-                for etf in only_in_excel:
-                    if etf not in new_etfs[:len(old_etfs)]:  # Not part of renames
-                        print(f"\n   Adding new ETF: {etf}")
-                        data_manager.add_etf(etf, 0, 0)  # Add with zero prices
-                        success_count += 1
-                
-                print(f"\n🎉 Update Complete!")
-                print(f"   Successfully updated: {success_count} ETFs")
-                print(f"   Backup file: {backup_file}")
-                
-                return True
-                
-            else:
-                print("❌ Update cancelled by user")
-                return False
+            return True
         
-        elif len(only_in_excel) > 0:
+        elif plan.adds:
             # Only new ETFs, no renames
-            print(f"\n➕ Adding {len(only_in_excel)} new ETFs...")
-            for etf in only_in_excel:
-                data_manager.add_etf(etf, 0, 0)
-                print(f"   + Added {etf}")
+            print(f"\n➕ Adding {len(plan.adds)} new ETFs...")
+            apply_sync_plan(data_manager, updater, plan)
             
-            print(f"✅ Added {len(only_in_excel)} new ETFs")
-            return True
-            
-        else:
-            print("✅ No changes needed - Excel and system are in sync!")
+            print(f"✅ Added {len(plan.adds)} new ETFs")
             return True
+        
+        # Only removals - data is kept, nothing to apply
+        print("ℹ️ No new or renamed ETFs in Excel - existing ETF data kept")
+        return True
     
     except Exception as e:
         print(f"❌ Error during sync: {e}")
         return False
 
+def sync_etf_names_auto():
+    """Non-interactive sync for cron/CI: applies the plan without prompting"""
+    return auto_sync_from_excel(auto_confirm=True)
+
 if __name__ == "__main__":
-    success = auto_sync_from_excel()
+    success = auto_sync_from_excel(auto_confirm="--yes" in sys.argv[1:])
     if success:
         print("\n🚀 ETF names successfully synced!")
         print("💡 You can now run enhanced_cli.py with updated ETF names")
@@ -7,7 +7,10 @@ from trading_strategy import ETFTradingStrategy
 from price_fetcher import PriceFetcher, PriceUpdateScheduler
 from volume_filter import VolumeFilter
 from investment_manager import InvestmentManager
+from session_store import create_result_cache, create_session_storage
 import json
+import re
+import weakref
 from datetime import datetime
 
 # Configure logging
@@ -17,210 +20,262 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Input shapes for the text-entry flows, matched in C instead of split/strip/float chains
+_NUMBER = r'(\d+(?:\.\d*)?|\.\d+)'
+_PRICE_LINE_RE = re.compile(r'\s*([^,\s]+)\s*,\s*' + _NUMBER + r'\s*,\s*' + _NUMBER + r'\s*')
+_QTY_PRICE_RE = re.compile(r'\s*(\d+)\s*,\s*' + _NUMBER + r'\s*')
+_LIVE_RE = re.compile(r'\s*(?:live|yahoo|fetch|auto)\s*', re.IGNORECASE)
+
+WELCOME_TEXT = """
+🤖 *ETF Trading Strategy Bot*
+
+Welcome! This bot helps you execute a systematic ETF trading strategy based on:
+• ETF rankings by deviation from 20-day moving average
+• Buying top-ranked ETFs not currently held
+• Averaging down on positions with >2.5% loss
+• LIFO selling with >6% profit threshold
+
+Choose an option from the menu below:
+        """
+
+MAIN_MENU_TEXT = "🤖 *ETF Trading Strategy Bot*\n\nChoose an option:"
+
+STATISTICS_TEMPLATE = (
+    "📋 *Trading Statistics*\n\n"
+    "Total Buy Transactions: {total_buy_transactions}\n"
+    "Total Sell Transactions: {total_sell_transactions}\n"
+    "Profitable Sells: {profitable_sells}\n"
+    "Loss Sells: {loss_sells}\n"
+    "Win Rate: {win_rate_percent}%\n"
+    "Total Realized Profit: ₹{total_realized_profit:,.2f}\n"
+    "Average Profit per Sell: ₹{average_profit_per_sell:,.2f}\n"
+)
+
+PRICE_UPDATE_PROMPT = """💰 *Update ETF Prices*
+
+🚀 *OPTION 1: LIVE DATA (RECOMMENDED)*
+Send: `live` or `yahoo` or `fetch`
+This will automatically fetch live prices from Yahoo Finance!
+
+📝 *OPTION 2: MANUAL ENTRY*
+Send price data in this format:
+`ETF_NAME,CMP,20DMA`
+
+Example:
+`GOLDBEES,45.50,44.20`
+
+Or send multiple ETFs (one per line):
+```
+GOLDBEES,45.50,44.20
+KOTAKGOLD,12.30,12.10
+SETFGOLD,50.75,49.80
+```
+
+Send your choice now:"""
+
 class ETFTradingBot:
-    def __init__(self, token: str):
+    def __init__(self, token: str, webhook_url: str = None, port: int = 8443, redis_url: str = None):
         self.token = token
+        self.webhook_url = webhook_url  # Public HTTPS base URL; None falls back to long polling
+        self.port = port
         self.data_manager = ETFDataManager()
         self.price_fetcher = PriceFetcher()
         self.volume_filter = VolumeFilter(self.data_manager, self.price_fetcher)
         self.investment_manager = InvestmentManager(self.data_manager)
         self.strategy = ETFTradingStrategy(self.data_manager, self.volume_filter)
         self.scheduler = PriceUpdateScheduler(self.data_manager, self.price_fetcher)
-        self.user_sessions = {}  # Store user interaction sessions
-        
-    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Start command handler"""
-        keyboard = [
+        self.sessions = create_session_storage(redis_url)  # Per-user state with 30 min expiry
+        self.cache = create_result_cache(redis_url)  # Computed views, 5 min TTL
+        self.store_lock = asyncio.Lock()  # Serializes data-store writes made off the event loop
+        self._write_queue = None  # (rows, future) batches awaiting the writer task; created in post_init
+        self._writer_task = None
+        # user_id -> asyncio.Lock serializing that user's session read-modify-write; a lock disappears once
+        # no handler holds or waits on it, so idle users cost nothing and no waiter ever loses its lock
+        self._user_locks = weakref.WeakValueDictionary()
+        
+        # Static keyboards are immutable - build them once
+        self._main_menu_markup = InlineKeyboardMarkup([
             [InlineKeyboardButton("📊 Daily Strategy", callback_data='daily_strategy')],
             [InlineKeyboardButton("📈 Portfolio", callback_data='portfolio')],
             [InlineKeyboardButton("🏆 Rankings", callback_data='rankings')],
             [InlineKeyboardButton("💰 Update Prices", callback_data='update_prices')],
             [InlineKeyboardButton("📋 Statistics", callback_data='statistics')]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        welcome_text = """
-🤖 *ETF Trading Strategy Bot*
-
-Welcome! This bot helps you execute a systematic ETF trading strategy based on:
-• ETF rankings by deviation from 20-day moving average
-• Buying top-ranked ETFs not currently held
-• Averaging down on positions with >2.5% loss
-• LIFO selling with >6% profit threshold
-
-Choose an option from the menu below:
-        """
-        
-        await update.message.reply_text(welcome_text, reply_markup=reply_markup, parse_mode='Markdown')
+        ])
+        self._back_to_menu_markup = InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Main Menu", callback_data='main_menu')]])
+        self._cancel_markup = InlineKeyboardMarkup([[InlineKeyboardButton("❌ Cancel", callback_data='main_menu')]])
+        
+        # callback_data / session state -> handler coroutine
+        self._callback_dispatch = {
+            'daily_strategy': self.show_daily_strategy,
+            'portfolio': self.show_portfolio,
+            'rankings': self.show_rankings,
+            'update_prices': self.prompt_price_update,
+            'statistics': self.show_statistics,
+            'use_default_investment': self.handle_default_investment,
+            'main_menu': self.show_main_menu
+        }
+        self._callback_prefix_dispatch = {
+            'buy': self.handle_buy_action,
+            'sell': self.handle_sell_action
+        }
+        self._qty_price_dispatch = {
+            'waiting_for_buy_details': self.process_buy_transaction,
+            'waiting_for_sell_details': self.process_sell_transaction
+        }
+        self._state_dispatch = {
+            'waiting_for_prices': self.process_price_updates,
+            'waiting_for_investment_amount': self.process_investment_amount_input,
+            'waiting_for_buy_details': self.process_buy_transaction,
+            'waiting_for_sell_details': self.process_sell_transaction
+        }
+        
+    async def run_blocking(self, func, *args):
+        """Run a blocking data-store call in a worker thread so the bot keeps serving other users"""
+        async with self.store_lock:
+            return await asyncio.to_thread(func, *args)
+    
+    async def get_daily_recommendations(self) -> dict:
+        """Daily recommendations, shared between the strategy view and the buy/sell buttons"""
+        return await self.cache.get_or_compute("reco:daily", self.strategy.get_daily_recommendations)
+    
+    async def invalidate_views(self):
+        """Drop cached views after prices or holdings change"""
+        await self.cache.invalidate("reco:daily", "rankings", "portfolio", "stats")
+    
+    def _lock_for(self, user_id: int) -> asyncio.Lock:
+        """Per-user lock: one user's updates run in order while different users proceed in parallel"""
+        return self._user_locks.setdefault(user_id, asyncio.Lock())
+    
+    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Start command handler"""
+        await update.message.reply_text(WELCOME_TEXT, reply_markup=self._main_menu_markup, parse_mode='Markdown')
     
     async def button_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle button clicks"""
         query = update.callback_query
         await query.answer()
         
-        if query.data == 'daily_strategy':
-            await self.show_daily_strategy(query, context)
-        elif query.data == 'portfolio':
-            await self.show_portfolio(query, context)
-        elif query.data == 'rankings':
-            await self.show_rankings(query, context)
-        elif query.data == 'update_prices':
-            await self.prompt_price_update(query, context)
-        elif query.data == 'statistics':
-            await self.show_statistics(query, context)
-        elif query.data.startswith('buy_'):
-            await self.handle_buy_action(query, context)
-        elif query.data.startswith('sell_'):
-            await self.handle_sell_action(query, context)
-        elif query.data == 'use_default_investment':
-            await self.handle_default_investment(query, context)
-        elif query.data == 'main_menu':
-            await self.show_main_menu(query, context)
+        handler = self._callback_dispatch.get(query.data)
+        if handler is None:
+            # buy_<ETF> / sell_<ETF> carry the ETF name after the prefix
+            handler = self._callback_prefix_dispatch.get(query.data.split('_', 1)[0])
+        
+        if handler is not None:
+            async with self._lock_for(query.from_user.id):
+                await handler(query, context)
     
     async def show_daily_strategy(self, query, context):
         """Show daily trading recommendations"""
-        recommendations = self.strategy.get_daily_recommendations()
+        recommendations = await self.get_daily_recommendations()
         
-        message = f"📊 *Daily Strategy - {recommendations['date']}*\n\n"
+        parts = [f"📊 *Daily Strategy - {recommendations['date']}*\n\n"]
         
         # Buy recommendation
         buy_rec = recommendations['buy_recommendation']
-        message += "🟢 *BUY RECOMMENDATION:*\n"
+        parts.append("🟢 *BUY RECOMMENDATION:*\n")
         if buy_rec['action'] != 'no_action':
-            message += f"ETF: {buy_rec['etf_name']}\n"
-            message += f"Action: {buy_rec['action'].replace('_', ' ').title()}\n"
-            message += f"Current Price: ₹{buy_rec.get('cmp', buy_rec.get('current_price', 'N/A'))}\n"
+            parts.append(f"ETF: {buy_rec['etf_name']}\n")
+            parts.append(f"Action: {buy_rec['action'].replace('_', ' ').title()}\n")
+            parts.append(f"Current Price: ₹{buy_rec.get('cmp', buy_rec.get('current_price', 'N/A'))}\n")
             if 'deviation_percent' in buy_rec:
-                message += f"Deviation: {buy_rec['deviation_percent']:.2f}%\n"
-            message += f"Reason: {buy_rec['reason']}\n"
+                parts.append(f"Deviation: {buy_rec['deviation_percent']:.2f}%\n")
+            parts.append(f"Reason: {buy_rec['reason']}\n")
         else:
-            message += f"No action recommended\nReason: {buy_rec['reason']}\n"
+            parts.append(f"No action recommended\nReason: {buy_rec['reason']}\n")
         
-        message += "\n🔴 *SELL RECOMMENDATION:*\n"
+        parts.append("\n🔴 *SELL RECOMMENDATION:*\n")
         sell_rec = recommendations['sell_recommendation']
         if sell_rec['action'] != 'no_action':
-            message += f"ETF: {sell_rec['etf_name']}\n"
-            message += f"Current Price: ₹{sell_rec['current_price']}\n"
-            message += f"Profit: {sell_rec['profit_percent']:.2f}%\n"
-            message += f"Reason: {sell_rec['reason']}\n"
+            parts.append(f"ETF: {sell_rec['etf_name']}\n")
+            parts.append(f"Current Price: ₹{sell_rec['current_price']}\n")
+            parts.append(f"Profit: {sell_rec['profit_percent']:.2f}%\n")
+            parts.append(f"Reason: {sell_rec['reason']}\n")
         else:
-            message += f"No action recommended\nReason: {sell_rec['reason']}\n"
-        
-        # Create action buttons
-        keyboard = []
-        if buy_rec['action'] != 'no_action':
-            keyboard.append([InlineKeyboardButton(
-                f"💰 Buy {buy_rec['etf_name']}", 
-                callback_data=f"buy_{buy_rec['etf_name']}"
-            )])
-        
-        if sell_rec['action'] != 'no_action':
-            keyboard.append([InlineKeyboardButton(
-                f"💸 Sell {sell_rec['etf_name']}", 
-                callback_data=f"sell_{sell_rec['etf_name']}"
-            )])
+            parts.append(f"No action recommended\nReason: {sell_rec['reason']}\n")
+        message = "".join(parts)
         
-        keyboard.append([InlineKeyboardButton("🏠 Main Menu", callback_data='main_menu')])
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        # Create action buttons - nothing to act on (the common case) reuses the static menu keyboard
+        if buy_rec['action'] == 'no_action' and sell_rec['action'] == 'no_action':
+            reply_markup = self._back_to_menu_markup
+        else:
+            keyboard = []
+            if buy_rec['action'] != 'no_action':
+                keyboard.append([InlineKeyboardButton(
+                    f"💰 Buy {buy_rec['etf_name']}", 
+                    callback_data=f"buy_{buy_rec['etf_name']}"
+                )])
+            
+            if sell_rec['action'] != 'no_action':
+                keyboard.append([InlineKeyboardButton(
+                    f"💸 Sell {sell_rec['etf_name']}", 
+                    callback_data=f"sell_{sell_rec['etf_name']}"
+                )])
+            
+            keyboard.extend(self._back_to_menu_markup.inline_keyboard)
+            reply_markup = InlineKeyboardMarkup(keyboard)
         
         await query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
     
     async def show_portfolio(self, query, context):
         """Show current portfolio"""
-        portfolio = self.data_manager.get_portfolio_summary()
-        
-        message = "📈 *Current Portfolio*\n\n"
-        message += f"Total ETFs: {portfolio['total_etfs']}\n"
-        message += f"Total Investment: ₹{portfolio['total_investments']:,.2f}\n"
-        message += f"Current Value: ₹{portfolio['current_value']:,.2f}\n"
-        message += f"P&L: ₹{portfolio['total_profit_loss']:,.2f}\n\n"
+        portfolio = await self.cache.get_or_compute("portfolio", self.data_manager.get_portfolio_summary)
+        
+        parts = [
+            "📈 *Current Portfolio*\n\n",
+            f"Total ETFs: {portfolio['total_etfs']}\n",
+            f"Total Investment: ₹{portfolio['total_investments']:,.2f}\n",
+            f"Current Value: ₹{portfolio['current_value']:,.2f}\n",
+            f"P&L: ₹{portfolio['total_profit_loss']:,.2f}\n\n"
+        ]
         
         if portfolio['holdings_detail']:
-            message += "*Holdings Detail:*\n"
+            parts.append("*Holdings Detail:*\n")
             for holding in portfolio['holdings_detail']:
-                message += f"\n🔸 {holding['etf_name']}\n"
-                message += f"   Qty: {holding['quantity']}\n"
-                message += f"   Avg Price: ₹{holding['avg_buy_price']}\n"
-                message += f"   Current: ₹{holding['current_price']}\n"
-                message += f"   P&L: ₹{holding['profit_loss']:.2f} ({holding['profit_loss_percent']:.2f}%)\n"
+                parts.extend((
+                    f"\n🔸 {holding['etf_name']}\n",
+                    f"   Qty: {holding['quantity']}\n",
+                    f"   Avg Price: ₹{holding['avg_buy_price']}\n",
+                    f"   Current: ₹{holding['current_price']}\n",
+                    f"   P&L: ₹{holding['profit_loss']:.2f} ({holding['profit_loss_percent']:.2f}%)\n"
+                ))
         else:
-            message += "No current holdings."
-        
-        keyboard = [[InlineKeyboardButton("🏠 Main Menu", callback_data='main_menu')]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+            parts.append("No current holdings.")
         
-        await query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+        await query.edit_message_text("".join(parts), reply_markup=self._back_to_menu_markup, parse_mode='Markdown')
     
     async def show_rankings(self, query, context):
         """Show ETF rankings"""
-        rankings = self.data_manager.get_etf_rankings()
+        rankings = await self.cache.get_or_compute("rankings", lambda: self.data_manager.get_etf_rankings(top_n=10))
         
-        message = "🏆 *ETF Rankings (Top 10)*\n"
-        message += "_Ranked by deviation from 20-day moving average_\n\n"
+        parts = ["🏆 *ETF Rankings (Top 10)*\n", "_Ranked by deviation from 20-day moving average_\n\n"]
         
         if rankings:
-            for i, (etf_name, cmp, dma_20, deviation) in enumerate(rankings[:10], 1):
-                message += f"{i}. {etf_name}\n"
-                message += f"   CMP: ₹{cmp:.2f} | 20DMA: ₹{dma_20:.2f}\n"
-                message += f"   Deviation: {deviation:.2f}%\n\n"
+            for i, (etf_name, cmp, dma_20, deviation) in enumerate(rankings, 1):
+                parts.append(
+                    f"{i}. {etf_name}\n"
+                    f"   CMP: ₹{cmp:.2f} | 20DMA: ₹{dma_20:.2f}\n"
+                    f"   Deviation: {deviation:.2f}%\n\n"
+                )
         else:
-            message += "No ETF data available. Please update prices first."
+            parts.append("No ETF data available. Please update prices first.")
         
-        keyboard = [[InlineKeyboardButton("🏠 Main Menu", callback_data='main_menu')]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+        await query.edit_message_text("".join(parts), reply_markup=self._back_to_menu_markup, parse_mode='Markdown')
     
     async def show_statistics(self, query, context):
         """Show trading statistics"""
-        stats = self.strategy.get_strategy_statistics()
-        
-        message = "📋 *Trading Statistics*\n\n"
-        message += f"Total Buy Transactions: {stats['total_buy_transactions']}\n"
-        message += f"Total Sell Transactions: {stats['total_sell_transactions']}\n"
-        message += f"Profitable Sells: {stats['profitable_sells']}\n"
-        message += f"Loss Sells: {stats['loss_sells']}\n"
-        message += f"Win Rate: {stats['win_rate_percent']}%\n"
-        message += f"Total Realized Profit: ₹{stats['total_realized_profit']:,.2f}\n"
-        message += f"Average Profit per Sell: ₹{stats['average_profit_per_sell']:,.2f}\n"
+        stats = await self.cache.get_or_compute("stats", self.strategy.get_strategy_statistics)
         
-        keyboard = [[InlineKeyboardButton("🏠 Main Menu", callback_data='main_menu')]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        message = STATISTICS_TEMPLATE.format_map(stats)
         
-        await query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+        await query.edit_message_text(message, reply_markup=self._back_to_menu_markup, parse_mode='Markdown')
     
     async def prompt_price_update(self, query, context):
         """Prompt for price updates"""
-        message = """💰 *Update ETF Prices*
-
-🚀 *OPTION 1: LIVE DATA (RECOMMENDED)*
-Send: `live` or `yahoo` or `fetch`
-This will automatically fetch live prices from Yahoo Finance!
-
-📝 *OPTION 2: MANUAL ENTRY*
-Send price data in this format:
-`ETF_NAME,CMP,20DMA`
-
-Example:
-`GOLDBEES,45.50,44.20`
-
-Or send multiple ETFs (one per line):
-```
-GOLDBEES,45.50,44.20
-KOTAKGOLD,12.30,12.10
-SETFGOLD,50.75,49.80
-```
-
-Send your choice now:"""
-        
         # Set user state for price updates
         user_id = query.from_user.id
-        self.user_sessions[user_id] = {'state': 'waiting_for_prices'}
-        
-        keyboard = [[InlineKeyboardButton("🏠 Main Menu", callback_data='main_menu')]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        await self.sessions.set(user_id, {'state': 'waiting_for_prices'})
         
-        await query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+        await query.edit_message_text(PRICE_UPDATE_PROMPT, reply_markup=self._back_to_menu_markup, parse_mode='Markdown')
     
     async def handle_buy_action(self, query, context):
         """Handle buy action with investment amount"""
@@ -228,29 +283,31 @@ Send your choice now:"""
         user_id = query.from_user.id
         
         # Get current recommendation
-        recommendations = self.strategy.get_daily_recommendations()
+        recommendations = await self.get_daily_recommendations()
         buy_rec = recommendations['buy_recommendation']
         
         if buy_rec['etf_name'] == etf_name:
             current_price = buy_rec.get('cmp', buy_rec.get('current_price', 0))
             default_investment = self.investment_manager.config["default_investment_per_trade"]
             
-            message = f"💰 *Buy {etf_name}*\n\n"
-            message += f"Current Price: ₹{current_price:.2f}\n"
-            message += f"Action: {buy_rec['action'].replace('_', ' ').title()}\n"
-            message += f"Reason: {buy_rec['reason']}\n\n"
-            message += f"💰 *Investment Amount*\n"
-            message += f"Default: ₹{default_investment:,}\n\n"
-            message += "Send your investment amount or press the button for default:\n"
-            message += "Example: `10000` for ₹10,000"
+            message = "".join([
+                f"💰 *Buy {etf_name}*\n\n",
+                f"Current Price: ₹{current_price:.2f}\n",
+                f"Action: {buy_rec['action'].replace('_', ' ').title()}\n",
+                f"Reason: {buy_rec['reason']}\n\n",
+                "💰 *Investment Amount*\n",
+                f"Default: ₹{default_investment:,}\n\n",
+                "Send your investment amount or press the button for default:\n",
+                "Example: `10000` for ₹10,000"
+            ])
             
             # Set user state
-            self.user_sessions[user_id] = {
+            await self.sessions.set(user_id, {
                 'state': 'waiting_for_investment_amount',
                 'etf_name': etf_name,
                 'recommendation': buy_rec,
                 'current_price': current_price
-            }
+            })
             
             keyboard = [
                 [InlineKeyboardButton(f"Use Default (₹{default_investment:,})", callback_data='use_default_investment')],
@@ -264,21 +321,46 @@ Send your choice now:"""
         """Handle using default investment amount"""
         user_id = query.from_user.id
         
-        if user_id not in self.user_sessions:
+        session = await self.sessions.get(user_id)
+        if session is None:
             await query.edit_message_text("❌ Session expired. Please start again.", parse_mode='Markdown')
             return
         
-        session = self.user_sessions[user_id]
         if session['state'] != 'waiting_for_investment_amount':
             await query.edit_message_text("❌ Invalid action. Please start again.", parse_mode='Markdown')
             return
         
         # Use default investment amount
         default_investment = self.investment_manager.config["default_investment_per_trade"]
-        await self.process_investment_amount(query, context, default_investment, session)
+        await self.process_investment_amount(query, context, user_id, default_investment, session)
     
-    async def process_investment_amount(self, query, context, investment_amount, session):
-        """Process the investment amount and show quantity suggestion"""
+    def _build_suggestion_message(self, etf_name, current_price, investment_amount, suggestion) -> str:
+        """Format the investment suggestion shown after an amount is chosen"""
+        suggested_qty = suggestion['suggested_quantity']
+        utilization = suggestion['utilization_percentage']
+        
+        if utilization < 80:
+            utilization_note = "⚠️ Low utilization - consider adjusting quantity"
+        elif utilization > 98:
+            utilization_note = "⚠️ High utilization - buffer may be insufficient"
+        else:
+            utilization_note = "✅ Good utilization - balanced investment"
+        
+        return "".join([
+            f"💰 *Investment Suggestion for {etf_name}*\n\n",
+            f"💵 Investment Amount: ₹{investment_amount:,.2f}\n",
+            f"💰 Current Price: ₹{current_price:.2f}\n",
+            f"📊 Suggested Quantity: *{suggested_qty}* units\n",
+            f"💸 Exact Cost: ₹{suggestion['exact_investment']:,.2f}\n",
+            f"📈 Utilization: {utilization:.1f}%\n\n",
+            f"{utilization_note}\n\n",
+            "Now send your transaction details:\n",
+            "`QUANTITY,ACTUAL_PRICE`\n\n",
+            f"Suggested: `{suggested_qty},{current_price:.2f}`"
+        ])
+    
+    async def _suggest_investment(self, user_id, investment_amount, session, reply_fn, **reply_kwargs):
+        """Compute the suggestion, advance the session and send it through reply_fn"""
         etf_name = session['etf_name']
         current_price = session['current_price']
         
@@ -287,49 +369,33 @@ Send your choice now:"""
             suggestion = self.investment_manager.get_investment_suggestion(
                 etf_name, current_price, investment_amount
             )
-            
-            suggested_qty = suggestion['suggested_quantity']
-            exact_investment = suggestion['exact_investment']
-            utilization = suggestion['utilization_percentage']
-            
-            message = f"💰 *Investment Suggestion for {etf_name}*\n\n"
-            message += f"💵 Investment Amount: ₹{investment_amount:,.2f}\n"
-            message += f"💰 Current Price: ₹{current_price:.2f}\n"
-            message += f"📊 Suggested Quantity: *{suggested_qty}* units\n"
-            message += f"💸 Exact Cost: ₹{exact_investment:,.2f}\n"
-            message += f"📈 Utilization: {utilization:.1f}%\n\n"
-            
-            if utilization < 80:
-                message += "⚠️ Low utilization - consider adjusting quantity\n\n"
-            elif utilization > 98:
-                message += "⚠️ High utilization - buffer may be insufficient\n\n"
-            else:
-                message += "✅ Good utilization - balanced investment\n\n"
-            
-            message += "Now send your transaction details:\n"
-            message += "`QUANTITY,ACTUAL_PRICE`\n\n"
-            message += f"Suggested: `{suggested_qty},{current_price:.2f}`"
+            message = self._build_suggestion_message(etf_name, current_price, investment_amount, suggestion)
             
             # Update session state
             session.update({
                 'state': 'waiting_for_buy_details',
                 'investment_amount': investment_amount,
-                'suggested_quantity': suggested_qty,
+                'suggested_quantity': suggestion['suggested_quantity'],
                 'suggestion': suggestion
             })
+            await self.sessions.set(user_id, session)
             
-            keyboard = [[InlineKeyboardButton("❌ Cancel", callback_data='main_menu')]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+            await reply_fn(message, parse_mode='Markdown', **reply_kwargs)
             
         except Exception as e:
-            await query.edit_message_text(f"❌ Error: {str(e)}", parse_mode='Markdown')
+            await reply_fn(f"❌ Error: {str(e)}")
     
-    async def process_investment_amount_input(self, update, context, message_text, session):
+    async def process_investment_amount(self, query, context, user_id, investment_amount, session):
+        """Process the investment amount and show quantity suggestion"""
+        await self._suggest_investment(
+            user_id, investment_amount, session, query.edit_message_text,
+            reply_markup=self._cancel_markup
+        )
+    
+    async def process_investment_amount_input(self, update, context, user_id, message_text, session):
         """Process custom investment amount input"""
         try:
-            investment_amount = float(message_text.strip())
+            investment_amount = float(message_text)
             
             # Validate investment amount
             min_amount = self.investment_manager.config["min_investment_per_trade"]
@@ -344,58 +410,18 @@ Send your choice now:"""
                 return
             
             # Process the investment amount
-            await self.process_investment_amount_message(update, context, investment_amount, session)
+            await self.process_investment_amount_message(update, context, user_id, investment_amount, session)
             
         except ValueError:
             await update.message.reply_text("❌ Invalid amount. Please enter a valid number.")
         except Exception as e:
             await update.message.reply_text(f"❌ Error: {str(e)}")
     
-    async def process_investment_amount_message(self, update, context, investment_amount, session):
+    async def process_investment_amount_message(self, update, context, user_id, investment_amount, session):
         """Process investment amount for message-based flow"""
-        etf_name = session['etf_name']
-        current_price = session['current_price']
-        
-        try:
-            # Get investment suggestion
-            suggestion = self.investment_manager.get_investment_suggestion(
-                etf_name, current_price, investment_amount
-            )
-            
-            suggested_qty = suggestion['suggested_quantity']
-            exact_investment = suggestion['exact_investment']
-            utilization = suggestion['utilization_percentage']
-            
-            message = f"💰 *Investment Suggestion for {etf_name}*\n\n"
-            message += f"💵 Investment Amount: ₹{investment_amount:,.2f}\n"
-            message += f"💰 Current Price: ₹{current_price:.2f}\n"
-            message += f"📊 Suggested Quantity: *{suggested_qty}* units\n"
-            message += f"💸 Exact Cost: ₹{exact_investment:,.2f}\n"
-            message += f"📈 Utilization: {utilization:.1f}%\n\n"
-            
-            if utilization < 80:
-                message += "⚠️ Low utilization - consider adjusting quantity\n\n"
-            elif utilization > 98:
-                message += "⚠️ High utilization - buffer may be insufficient\n\n"
-            else:
-                message += "✅ Good utilization - balanced investment\n\n"
-            
-            message += "Now send your transaction details:\n"
-            message += "`QUANTITY,ACTUAL_PRICE`\n\n"
-            message += f"Suggested: `{suggested_qty},{current_price:.2f}`"
-            
-            # Update session state
-            session.update({
-                'state': 'waiting_for_buy_details',
-                'investment_amount': investment_amount,
-                'suggested_quantity': suggested_qty,
-                'suggestion': suggestion
-            })
-            
-            await update.message.reply_text(message, parse_mode='Markdown')
-            
-        except Exception as e:
-            await update.message.reply_text(f"❌ Error: {str(e)}")
+        await self._suggest_investment(
+            user_id, investment_amount, session, update.message.reply_text
+        )
     
     async def handle_sell_action(self, query, context):
         """Handle sell action"""
@@ -403,89 +429,119 @@ Send your choice now:"""
         user_id = query.from_user.id
         
         # Get current recommendation
-        recommendations = self.strategy.get_daily_recommendations()
+        recommendations = await self.get_daily_recommendations()
         sell_rec = recommendations['sell_recommendation']
         
         if sell_rec['etf_name'] == etf_name:
-            message = f"💸 *Sell {etf_name}*\n\n"
-            message += f"Current Price: ₹{sell_rec['current_price']:.2f}\n"
-            message += f"Expected Profit: {sell_rec['profit_percent']:.2f}%\n\n"
-            message += "Send your transaction details in this format:\n"
-            message += "`QUANTITY,ACTUAL_PRICE`\n\n"
-            message += "Example: `5,48.25`"
+            message = "".join([
+                f"💸 *Sell {etf_name}*\n\n",
+                f"Current Price: ₹{sell_rec['current_price']:.2f}\n",
+                f"Expected Profit: {sell_rec['profit_percent']:.2f}%\n\n",
+                "Send your transaction details in this format:\n",
+                "`QUANTITY,ACTUAL_PRICE`\n\n",
+                "Example: `5,48.25`"
+            ])
             
             # Set user state
-            self.user_sessions[user_id] = {
+            await self.sessions.set(user_id, {
                 'state': 'waiting_for_sell_details',
                 'etf_name': etf_name,
                 'recommendation': sell_rec
-            }
-            
-            keyboard = [[InlineKeyboardButton("❌ Cancel", callback_data='main_menu')]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            })
             
-            await query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+            await query.edit_message_text(message, reply_markup=self._cancel_markup, parse_mode='Markdown')
     
     async def show_main_menu(self, query, context):
         """Show main menu"""
-        keyboard = [
-            [InlineKeyboardButton("📊 Daily Strategy", callback_data='daily_strategy')],
-            [InlineKeyboardButton("📈 Portfolio", callback_data='portfolio')],
-            [InlineKeyboardButton("🏆 Rankings", callback_data='rankings')],
-            [InlineKeyboardButton("💰 Update Prices", callback_data='update_prices')],
-            [InlineKeyboardButton("📋 Statistics", callback_data='statistics')]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        message = "🤖 *ETF Trading Strategy Bot*\n\nChoose an option:"
-        await query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+        await query.edit_message_text(MAIN_MENU_TEXT, reply_markup=self._main_menu_markup, parse_mode='Markdown')
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle text messages"""
+        """Handle text messages that no shape-specific handler claimed"""
         user_id = update.effective_user.id
-        message_text = update.message.text.strip()
-        
-        if user_id not in self.user_sessions:
+        text = update.message.text.strip()
+        async with self._lock_for(user_id):
+            session = await self.sessions.get(user_id)
+            await self._dispatch_state(update, context, user_id, text, session)
+    
+    async def _dispatch_state(self, update, context, user_id, text, session):
+        """Route a text message to the handler for the user's current session state"""
+        if session is None:
             await update.message.reply_text("Please use /start to begin.")
             return
         
-        session = self.user_sessions[user_id]
-        
-        if session['state'] == 'waiting_for_prices':
-            await self.process_price_updates(update, context, message_text)
-        elif session['state'] == 'waiting_for_investment_amount':
-            await self.process_investment_amount_input(update, context, message_text, session)
-        elif session['state'] == 'waiting_for_buy_details':
-            await self.process_buy_transaction(update, context, message_text, session)
-        elif session['state'] == 'waiting_for_sell_details':
-            await self.process_sell_transaction(update, context, message_text, session)
+        handler = self._state_dispatch.get(session['state'])
+        if handler is not None:
+            await handler(update, context, user_id, text, session)
+    
+    async def handle_live_request(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Messages shaped like live/yahoo/fetch/auto"""
+        user_id = update.effective_user.id
+        text = update.message.text.strip()
+        async with self._lock_for(user_id):
+            session = await self.sessions.get(user_id)
+            if session is not None and session['state'] == 'waiting_for_prices':
+                await self.process_price_updates_live(update, context, user_id)
+            else:
+                await self._dispatch_state(update, context, user_id, text, session)
     
-    async def process_price_updates(self, update, context, message_text):
+    async def handle_qty_price(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Messages shaped like QUANTITY,PRICE - buy or sell details depending on the session"""
+        user_id = update.effective_user.id
+        text = update.message.text.strip()
+        async with self._lock_for(user_id):
+            session = await self.sessions.get(user_id)
+            handler = self._qty_price_dispatch.get(session['state']) if session is not None else None
+            if handler is not None:
+                await handler(update, context, user_id, text, session)
+            else:
+                await self._dispatch_state(update, context, user_id, text, session)
+    
+    async def process_price_updates_live(self, update, context, user_id):
+        """Fetch live prices for every ETF and clear the session"""
+        fetch_task = None
+        try:
+            # Get ALL ETF names from the loaded list (no limit)
+            all_etf_names = list(self.data_manager.data["etfs"].keys())
+            
+            async def report_progress(done, total):
+                await update.message.reply_text(f"⏳ Fetched {done}/{total} ETFs...")
+            
+            async def fetch_all():
+                # Network fetch runs unlocked; the store lock is only held to apply the rows and save
+                rows = await self.scheduler.fetch_all_etf_quotes_async(all_etf_names, progress=report_progress)
+                return await self.run_blocking(self.data_manager.update_etf_prices_bulk, rows)
+            
+            # Start fetching live data for ALL ETFs right away; the status messages go out while it runs
+            fetch_task = asyncio.create_task(fetch_all())
+            await update.message.reply_text("🔄 Fetching live prices from Yahoo Finance for ALL ETFs...")
+            await update.message.reply_text(f"📊 Found {len(all_etf_names)} ETFs to update...")
+            
+            updated_count = await fetch_task
+            await self.invalidate_views()
+            
+            response = f"🎉 Successfully updated {updated_count} ETFs with live data from Yahoo Finance!"
+            
+            # Clear user session
+            await self.sessions.delete(user_id)
+            
+            await update.message.reply_text(response)
+            
+        except Exception as e:
+            if fetch_task is not None and not fetch_task.done():
+                fetch_task.cancel()
+            await update.message.reply_text(f"❌ Error processing updates: {str(e)}")
+    
+    async def process_price_updates(self, update, context, user_id, message_text, session=None):
         """Process ETF price updates"""
         try:
             # Check if user wants to fetch live data
-            if message_text.strip().lower() in ['live', 'fetch', 'auto', 'yahoo']:
-                await update.message.reply_text("🔄 Fetching live prices from Yahoo Finance for ALL ETFs...")
-                
-                # Get ALL ETF names from the loaded list (no limit)
-                all_etf_names = list(self.data_manager.data["etfs"].keys())
-                
-                await update.message.reply_text(f"📊 Found {len(all_etf_names)} ETFs to update. This may take a moment...")
-                
-                # Fetch live data for ALL ETFs
-                updated_count = self.scheduler.update_all_etf_prices(all_etf_names)
-                
-                response = f"🎉 Successfully updated {updated_count} ETFs with live data from Yahoo Finance!"
-                
-                # Clear user session
-                del self.user_sessions[update.effective_user.id]
-                
-                await update.message.reply_text(response)
+            if _LIVE_RE.fullmatch(message_text):
+                await self.process_price_updates_live(update, context, user_id)
                 return
             
             # Manual price update processing
-            lines = message_text.strip().split('\n')
-            updated_count = 0
+            lines = message_text.split('\n')
+            rows = []
             errors = []
             
             for line in lines:
@@ -493,44 +549,38 @@ Send your choice now:"""
                 if not line:
                     continue
                 
-                parts = line.split(',')
-                if len(parts) != 3:
+                match = _PRICE_LINE_RE.fullmatch(line)
+                if match is None:
                     errors.append(f"Invalid format: {line}")
                     continue
                 
-                etf_name, cmp_str, dma_str = [p.strip() for p in parts]
-                
-                try:
-                    cmp = float(cmp_str)
-                    dma_20 = float(dma_str)
-                    
-                    self.data_manager.update_etf_price(etf_name, cmp, dma_20)
-                    updated_count += 1
-                except ValueError:
-                    errors.append(f"Invalid numbers in: {line}")
+                rows.append((match.group(1), float(match.group(2)), float(match.group(3))))
+            
+            # Hand rows to the writer task - it merges them and saves once per flush; a failed save raises here
+            updated_count = await self.queue_price_writes(rows)
             
             response = f"✅ Updated {updated_count} ETF(s) successfully!"
             if errors:
                 response += f"\n\n❌ Errors:\n" + "\n".join(errors)
             
             # Clear user session
-            del self.user_sessions[update.effective_user.id]
+            await self.sessions.delete(user_id)
             
             await update.message.reply_text(response)
             
         except Exception as e:
             await update.message.reply_text(f"❌ Error processing updates: {str(e)}")
     
-    async def process_buy_transaction(self, update, context, message_text, session):
+    async def process_buy_transaction(self, update, context, user_id, message_text, session):
         """Process buy transaction"""
         try:
-            parts = message_text.strip().split(',')
-            if len(parts) != 2:
+            match = _QTY_PRICE_RE.fullmatch(message_text)
+            if match is None:
                 await update.message.reply_text("❌ Invalid format. Use: QUANTITY,PRICE")
                 return
             
-            quantity = int(parts[0].strip())
-            price = float(parts[1].strip())
+            quantity = int(match.group(1))
+            price = float(match.group(2))
             
             # Validate inputs
             is_valid, validation_msg = self.strategy.validate_transaction_inputs(quantity, price)
@@ -539,13 +589,13 @@ Send your choice now:"""
                 return
             
             # Execute transaction
-            result = self.strategy.execute_buy_recommendation(
-                session['recommendation'], quantity, price
+            result = await self.run_blocking(
+                self.strategy.execute_buy_recommendation, session['recommendation'], quantity, price
             )
             
             if result['success']:
-                response = f"✅ {result['message']}\n"
-                response += f"Total Amount: ₹{result['total_amount']:,.2f}"
+                await self.invalidate_views()
+                parts = [f"✅ {result['message']}\n", f"Total Amount: ₹{result['total_amount']:,.2f}"]
                 
                 # Add investment efficiency information if available
                 if 'investment_amount' in session:
@@ -553,19 +603,23 @@ Send your choice now:"""
                     suggested_qty = session.get('suggested_quantity', 'N/A')
                     utilization = (result['total_amount'] / target_investment) * 100
                     
-                    response += f"\n\n📊 Investment Analysis:"
-                    response += f"\nTarget Investment: ₹{target_investment:,.2f}"
-                    response += f"\nSuggested Quantity: {suggested_qty}"
-                    response += f"\nActual Quantity: {quantity}"
-                    response += f"\nInvestment Utilization: {utilization:.1f}%"
+                    parts.extend((
+                        "\n\n📊 Investment Analysis:",
+                        f"\nTarget Investment: ₹{target_investment:,.2f}",
+                        f"\nSuggested Quantity: {suggested_qty}",
+                        f"\nActual Quantity: {quantity}",
+                        f"\nInvestment Utilization: {utilization:.1f}%"
+                    ))
                     
                     if abs(result['total_amount'] - target_investment) > target_investment * 0.1:
-                        response += f"\n⚠️ Significant difference from target investment"
+                        parts.append("\n⚠️ Significant difference from target investment")
+                
+                response = "".join(parts)
             else:
                 response = f"❌ {result['message']}"
             
             # Clear user session
-            del self.user_sessions[update.effective_user.id]
+            await self.sessions.delete(user_id)
             
             await update.message.reply_text(response)
             
@@ -574,16 +628,16 @@ Send your choice now:"""
         except Exception as e:
             await update.message.reply_text(f"❌ Error: {str(e)}")
     
-    async def process_sell_transaction(self, update, context, message_text, session):
+    async def process_sell_transaction(self, update, context, user_id, message_text, session):
         """Process sell transaction"""
         try:
-            parts = message_text.strip().split(',')
-            if len(parts) != 2:
+            match = _QTY_PRICE_RE.fullmatch(message_text)
+            if match is None:
                 await update.message.reply_text("❌ Invalid format. Use: QUANTITY,PRICE")
                 return
             
-            quantity = int(parts[0].strip())
-            price = float(parts[1].strip())
+            quantity = int(match.group(1))
+            price = float(match.group(2))
             
             # Validate inputs
             is_valid, validation_msg = self.strategy.validate_transaction_inputs(quantity, price)
@@ -592,18 +646,21 @@ Send your choice now:"""
                 return
             
             # Execute transaction
-            result = self.strategy.execute_sell_recommendation(
-                session['recommendation'], quantity, price
+            result = await self.run_blocking(
+                self.strategy.execute_sell_recommendation, session['recommendation'], quantity, price
             )
             
             if result['success']:
-                response = f"✅ {result['message']}\n"
-                response += f"Profit: ₹{result['profit']:,.2f} ({result['profit_percent']:.2f}%)"
+                await self.invalidate_views()
+                response = (
+                    f"✅ {result['message']}\n"
+                    f"Profit: ₹{result['profit']:,.2f} ({result['profit_percent']:.2f}%)"
+                )
             else:
                 response = f"❌ {result['message']}"
             
             # Clear user session
-            del self.user_sessions[update.effective_user.id]
+            await self.sessions.delete(user_id)
             
             await update.message.reply_text(response)
             
@@ -612,29 +669,147 @@ Send your choice now:"""
         except Exception as e:
             await update.message.reply_text(f"❌ Error: {str(e)}")
     
+    async def queue_price_writes(self, rows) -> int:
+        """
+        Hand (etf_name, cmp, dma_20) rows to the writer task and wait until they are saved
+        
+        Writes directly if the writer isn't running. Returns the number of rows written;
+        raises whatever the save raised, so callers can tell the user.
+        """
+        if not rows:
+            return 0
+        if self._write_queue is None:
+            count = await self.run_blocking(self.data_manager.update_etf_prices_bulk, rows)
+            await self.invalidate_views()
+            return count
+        
+        saved = asyncio.get_running_loop().create_future()
+        self._write_queue.put_nowait((rows, saved))
+        return await saved
+    
+    async def _flush_price_writes(self) -> int:
+        """Drain the write queue, keep the latest row per ETF and persist them with one save"""
+        merged = {}
+        batches = []
+        while not self._write_queue.empty():
+            rows, saved = self._write_queue.get_nowait()
+            batches.append((rows, saved))
+            for etf_name, cmp, dma_20 in rows:
+                merged[etf_name] = (etf_name, cmp, dma_20)
+        
+        if not merged:
+            return 0
+        try:
+            count = await self.run_blocking(self.data_manager.update_etf_prices_bulk, list(merged.values()))
+            await self.invalidate_views()
+        except asyncio.CancelledError:
+            # Writer stopped mid-flush (shutdown) - requeue so the final flush still saves and answers them
+            for batch in batches:
+                self._write_queue.put_nowait(batch)
+            raise
+        except Exception as e:
+            for _, saved in batches:
+                if not saved.done():
+                    saved.set_exception(e)
+            raise
+        
+        for rows, saved in batches:
+            if not saved.done():
+                saved.set_result(len(rows))
+        return count
+    
+    async def _writer_loop(self, interval: float = 0.5):
+        """Single consumer for price writes: one JSON save per interval however many updates arrived"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._flush_price_writes()
+            except Exception as e:
+                logger.error(f"Error writing queued price updates: {e}")
+    
+    async def _load_etf_list(self):
+        """Load etf-list.xlsx in a worker thread (parquet sidecar cache makes warm starts cheap)"""
+        try:
+            await self.run_blocking(self.data_manager.load_etf_list_from_excel, "etf-list.xlsx")
+            # Views requested while the load ran were cached without the new ETFs
+            await self.invalidate_views()
+            logger.info("ETF list loaded successfully")
+        except Exception as e:
+            logger.error(f"Error loading ETF list: {e}")
+    
+    async def _gc_sessions(self, interval: int = 300):
+        """Periodically drop expired sessions so idle users don't pin memory"""
+        while True:
+            await asyncio.sleep(interval)
+            purged = self.sessions.purge_expired()
+            if purged:
+                logger.info(f"Purged {purged} expired sessions")
+    
+    async def _startup(self, application):
+        """post_init hook: start the ETF list load in the background so updates are served right away"""
+        self._etf_list_task = asyncio.create_task(self._load_etf_list())
+        self._session_gc_task = asyncio.create_task(self._gc_sessions())
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        
+        # One pooled HTTP client for every async price fetch (keep-alive across updates)
+        self.http = self.price_fetcher.create_async_client()
+        self.price_fetcher.async_client = self.http
+    
+    async def _shutdown(self, application):
+        """post_shutdown hook: flush queued price writes and release pooled connections"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+            try:
+                await self._flush_price_writes()
+            except Exception as e:
+                logger.error(f"Error flushing queued price updates: {e}")
+            self._write_queue = None
+        
+        if self.price_fetcher.async_client is not None:
+            await self.price_fetcher.async_client.aclose()
+            self.price_fetcher.async_client = None
+    
     def run(self):
         """Run the bot"""
-        application = Application.builder().token(self.token).build()
+        # Handle updates from different users concurrently; per-user locks keep each conversation in order
+        application = (
+            Application.builder().token(self.token)
+            .concurrent_updates(True)
+            .post_init(self._startup).post_shutdown(self._shutdown)
+            .build()
+        )
         
         # Add handlers
         application.add_handler(CommandHandler("start", self.start))
         application.add_handler(CallbackQueryHandler(self.button_handler))
+        # Shape-specific text handlers first; PTB stops at the first match in the group
+        application.add_handler(MessageHandler(filters.Regex(re.compile(r'^' + _LIVE_RE.pattern + r'$', re.IGNORECASE)), self.handle_live_request))
+        application.add_handler(MessageHandler(filters.Regex(re.compile(r'^' + _QTY_PRICE_RE.pattern + r'$')), self.handle_qty_price))
         application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
         
-        # Initialize ETF list
-        try:
-            self.data_manager.load_etf_list_from_excel("etf-list.xlsx")
-            logger.info("ETF list loaded successfully")
-        except Exception as e:
-            logger.error(f"Error loading ETF list: {e}")
-        
-        # Run the bot
+        # Run the bot - Telegram pushes updates via webhook when a public URL is configured
         logger.info("Starting ETF Trading Bot...")
-        application.run_polling()
+        if self.webhook_url:
+            application.run_webhook(
+                listen="0.0.0.0",
+                port=self.port,
+                url_path=self.token,
+                webhook_url=f"{self.webhook_url.rstrip('/')}/{self.token}"
+            )
+        else:
+            # True long polling: each getUpdates call waits up to 30s for new updates
+            application.run_polling(poll_interval=0, timeout=30)
 
 if __name__ == "__main__":
     # Load bot token from config file
     try:
+        import bot_config
         from bot_config import BOT_TOKEN
         
         if BOT_TOKEN == "YOUR_BOT_TOKEN_HERE" or not BOT_TOKEN:
@@ -646,7 +821,12 @@ if __name__ == "__main__":
         print("🤖 Starting ETF Trading Telegram Bot...")
         print(f"Bot token loaded successfully!")
         
-        bot = ETFTradingBot(BOT_TOKEN)
+        bot = ETFTradingBot(
+            BOT_TOKEN,
+            webhook_url=getattr(bot_config, "WEBHOOK_URL", None),
+            port=getattr(bot_config, "PORT", 8443),
+            redis_url=getattr(bot_config, "REDIS_URL", None)
+        )
         bot.run()
         
     except ImportError:
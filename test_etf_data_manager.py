@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test the streaming Excel reader behind the ETF list load
+"""
+
+import zipfile
+import pytest
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+def _write_xlsx(path, sheet_data: str):
+    """Minimal single-sheet workbook: just the parts iter_etf_names_from_excel reads"""
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr("xl/workbook.xml", (
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="ETFs" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ))
+        archive.writestr("xl/_rels/workbook.xml.rels", (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>'
+        ))
+        archive.writestr("xl/worksheets/sheet1.xml",
+                         f'<worksheet xmlns="{MAIN_NS}"><sheetData>{sheet_data}</sheetData></worksheet>')
+
+def _cell(text: str) -> str:
+    return f'<c t="inlineStr"><is><t>{text}</t></is></c>'
+
+def test_cells_without_references_are_read(tmp_path):
+    from etf_data_manager import ETFDataManager
+    
+    # No r attributes at all - rows and cells are positioned by document order
+    excel_file = tmp_path / "etf-list.xlsx"
+    _write_xlsx(excel_file, (
+        f"<row>{_cell('ETF Name')}{_cell('Notes')}</row>"
+        f"<row>{_cell('GOLDBEES')}{_cell('gold')}</row>"
+        f"<row>{_cell('ITBEES')}</row>"
+    ))
+    
+    manager = ETFDataManager(str(tmp_path / "etf_data.json"))
+    
+    assert list(manager.iter_etf_names_from_excel(str(excel_file))) == ['GOLDBEES', 'ITBEES']
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test the Excel name-sync planning (rename pairing and plan diffing)
+"""
+
+import pytest
+import etf_sync
+from etf_sync import compute_sync_plan, pair_renames
+
+@pytest.fixture(params=["assignment", "greedy"], autouse=True)
+def pairing(request, monkeypatch):
+    """Run every test with scipy's optimal assignment and with the greedy fallback"""
+    if request.param == "assignment":
+        if etf_sync.linear_sum_assignment is None:
+            pytest.skip("scipy not installed")
+    else:
+        monkeypatch.setattr(etf_sync, "linear_sum_assignment", None)
+    return request.param
+
+def test_renamed_etfs_are_paired():
+    pairs = pair_renames(["GOLDBEES", "ITBEES"], ["GOLDBEESETF", "ITBEESETF"])
+    
+    assert pairs == [("GOLDBEES", "GOLDBEESETF"), ("ITBEES", "ITBEESETF")]
+
+def test_pairs_below_threshold_are_rejected():
+    assert pair_renames(["GOLDBEES"], ["LIQUIDCASE"]) == []
+    
+    plan = compute_sync_plan({"GOLDBEES": {}, "NIFTYBEES": {}}.keys(), ["NIFTYBEES", "LIQUIDCASE"])
+    
+    assert plan.renames == []
+    assert plan.removes == ["GOLDBEES"]
+    assert plan.adds == ["LIQUIDCASE"]
+
+def test_new_name_matching_several_old_names_is_used_once():
+    # Both old names clear the threshold against the one new name; only the best match is a rename
+    plan = compute_sync_plan({"BANKBEES", "PSUBNKBEES"}, ["BANKBEESETF"])
+    
+    assert plan.renames == [("BANKBEES", "BANKBEESETF")]
+    assert plan.removes == ["PSUBNKBEES"]
+    assert plan.adds == []
+
+def test_in_sync_lists_short_circuit(monkeypatch):
+    def no_pairing(*args, **kwargs):
+        raise AssertionError("in-sync lists should not be paired")
+    monkeypatch.setattr(etf_sync, "pair_renames", no_pairing)
+    
+    plan = compute_sync_plan({"GOLDBEES", "ITBEES"}, ["ITBEES", "GOLDBEES"])
+    
+    assert plan.common == {"GOLDBEES", "ITBEES"}
+    assert plan.renames == plan.adds == plan.removes == []
+    assert plan.only_in_current == plan.only_in_excel == []
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test PriceFetcher's local history caching
+"""
+
+import pytest
+
+class _StubTicker:
+    """yf.Ticker stand-in serving weekday bars for any range, counting downloads"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def history(self, start=None, end=None, **kwargs):
+        import numpy as np
+        import pandas as pd
+        self.calls += 1
+        index = pd.bdate_range(start, end, inclusive='left')
+        return pd.DataFrame({'Close': np.linspace(100.0, 110.0, len(index)),
+                             'Volume': np.full(len(index), 50_000.0)}, index=index)
+
+@pytest.fixture
+def cached_fetcher(tmp_path, monkeypatch):
+    """PriceFetcher with its parquet cache in a temp dir and a stub ticker instead of Yahoo"""
+    pytest.importorskip("pyarrow")
+    from price_fetcher import PriceFetcher
+    fetcher = PriceFetcher()
+    fetcher.history_cache_dir = str(tmp_path)
+    ticker = _StubTicker()
+    monkeypatch.setattr(fetcher, "_get_ticker", lambda yahoo_symbol: ticker)
+    return fetcher, ticker
+
+def test_weekend_start_served_from_cache(cached_fetcher):
+    fetcher, ticker = cached_fetcher
+    
+    # 2024-06-01 is a Saturday - the first bar is Monday 2024-06-03
+    first = fetcher.fetch_historical_data('GOLDBEES', '2024-06-01', '2024-07-15')
+    second = fetcher.fetch_historical_data('GOLDBEES', '2024-06-01', '2024-07-15')
+    
+    assert ticker.calls == 1
+    assert first is not None and second is not None
+    assert list(second.index) == list(first.index)
+    assert second.index.min().date().isoformat() == '2024-06-03'
+
+def test_compute_mas_skips_missing_closes():
+    import numpy as np
+    from price_fetcher import compute_mas
+    
+    closes = np.arange(1.0, 31.0)
+    closes[5] = np.nan  # a missing bar early in the series
+    
+    mas = compute_mas(closes, [5, 20, 30])
+    
+    assert mas['ma_5'] == 28.0
+    assert mas['ma_20'] == round(float(np.arange(11.0, 31.0).mean()), 2)
+    assert mas['ma_30'] is None  # only 29 real closes
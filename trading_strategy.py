@@ -1,10 +1,23 @@
 from etf_data_manager import ETFDataManager
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+import time
+
+@lru_cache(maxsize=1)
+def _today_str(minute_bucket: int) -> str:
+    """Today's date as YYYY-MM-DD, formatted once per minute bucket"""
+    return datetime.now().strftime("%Y-%m-%d")
 
 class ETFTradingStrategy:
     """Implements the ETF trading strategy logic"""
     
+    __slots__ = (
+        "data_manager", "volume_filter", "max_rank_to_consider", "averaging_loss_threshold",
+        "profit_threshold", "max_daily_transactions", "volume_filtering_enabled", "_qualified_cache"
+    )
+    
     def __init__(self, data_manager: ETFDataManager, volume_filter=None):
         self.data_manager = data_manager
         self.volume_filter = volume_filter
@@ -13,11 +26,22 @@ class ETFTradingStrategy:
         self.profit_threshold = 6.0  # 6% profit threshold for selling
         self.max_daily_transactions = 1  # Max 1 buy and 1 sell per day
         self.volume_filtering_enabled = True  # Enable volume filtering by default
+        self._qualified_cache = None  # (volume filter generation, data_manager.etf_names, qualified set)
     
-    def get_buy_recommendation(self) -> Optional[Dict]:
-        """Get buy recommendation based on strategy rules"""
-        rankings = self.data_manager.get_etf_rankings()
-        current_holdings = self.data_manager.get_current_holdings()
+    def _qualified_etf_set(self) -> frozenset:
+        """Volume-qualified ETF names, rebuilt only when the filter results or the ETF list change"""
+        etf_names = self.data_manager.etf_names
+        cached = self._qualified_cache
+        if cached is None or cached[0] != self.volume_filter.generation or cached[1] is not etf_names:
+            cached = (self.volume_filter.generation, etf_names, frozenset(self.volume_filter.get_qualified_etfs()))
+            self._qualified_cache = cached
+        return cached[2]
+    
+    def get_buy_recommendation(self, rankings: List[Tuple[str, float, float, float]] = None,
+                               holdings: Dict[str, List[Dict]] = None) -> Optional[Dict]:
+        """Get buy recommendation based on strategy rules (pass rankings/holdings to reuse ones already computed)"""
+        if rankings is None:
+            rankings = self.data_manager.get_etf_rankings()
         
         if not rankings:
             return {
@@ -25,44 +49,39 @@ class ETFTradingStrategy:
                 "reason": "No ETF data available for ranking"
             }
         
-        # Filter rankings by volume qualification if enabled
+        # Get top ranked ETFs, filtered by volume qualification if enabled; stop after max_rank_to_consider hits
         if self.volume_filtering_enabled and self.volume_filter:
-            qualified_etfs = set(self.volume_filter.get_qualified_etfs())
-            volume_filtered_rankings = [
-                (etf_name, cmp, dma_20, deviation) 
-                for etf_name, cmp, dma_20, deviation in rankings 
-                if etf_name in qualified_etfs
-            ]
+            qualified_etfs = self._qualified_etf_set()
+            top_etfs = list(islice(
+                (ranking for ranking in rankings if ranking[0] in qualified_etfs),
+                self.max_rank_to_consider
+            ))
             
-            if not volume_filtered_rankings:
+            if not top_etfs:
                 return {
                     "action": "no_action",
                     "reason": "No volume-qualified ETFs available for trading"
                 }
             
-            rankings = volume_filtered_rankings
-            
         # Alternative volume filtering using ETF data if no volume_filter object
         elif self.volume_filtering_enabled and not self.volume_filter:
-            volume_filtered_rankings = []
-            for etf_name, cmp, dma_20, deviation in rankings:
-                etf_data = self.data_manager.data["etfs"].get(etf_name, {})
-                is_volume_qualified = etf_data.get("volume_qualified", True)  # Default to True if not checked
-                
-                if is_volume_qualified:
-                    volume_filtered_rankings.append((etf_name, cmp, dma_20, deviation))
+            # Unchecked ETFs count as qualified, so filter on the (cached) explicitly-disqualified set
+            disqualified_etfs = self.data_manager.volume_disqualified_etf_names
+            top_etfs = list(islice(
+                (ranking for ranking in rankings if ranking[0] not in disqualified_etfs),
+                self.max_rank_to_consider
+            ))
             
-            if not volume_filtered_rankings:
+            if not top_etfs:
                 return {
                     "action": "no_action",
                     "reason": "No volume-qualified ETFs meet minimum volume threshold (>50,000)"
                 }
-            
-            rankings = volume_filtered_rankings
         
-        # Get top ranked ETFs (after volume filtering)
-        top_etfs = rankings[:self.max_rank_to_consider]
-        held_etf_names = set(current_holdings.keys())
+        else:
+            top_etfs = rankings[:self.max_rank_to_consider]
+        # Cached on the data manager; rebuilt only after a buy, sell or rename
+        held_etf_names = self.data_manager.held_etf_names
         
         # Rule 1: Find new ETF (not currently held) with highest rank
         for rank, (etf_name, cmp, dma_20, deviation) in enumerate(top_etfs, 1):
@@ -78,7 +97,7 @@ class ETFTradingStrategy:
                 }
         
         # Rule 2: All top ETFs are held, check for averaging down
-        averaging_candidates = self.data_manager.get_etfs_for_averaging(self.averaging_loss_threshold)
+        averaging_candidates = self.data_manager.get_etfs_for_averaging(self.averaging_loss_threshold, holdings)
         
         if averaging_candidates:
             etf_name, loss_percent, current_price = averaging_candidates[0]
@@ -96,9 +115,9 @@ class ETFTradingStrategy:
             "reason": "All top ETFs are held and none qualify for averaging down"
         }
     
-    def get_sell_recommendation(self) -> Optional[Dict]:
+    def get_sell_recommendation(self, holdings: Dict[str, List[Dict]] = None) -> Optional[Dict]:
         """Get sell recommendation based on profit threshold"""
-        selling_candidates = self.data_manager.get_etfs_for_selling(self.profit_threshold)
+        selling_candidates = self.data_manager.get_etfs_for_selling(self.profit_threshold, holdings)
         
         if selling_candidates:
             etf_name, profit_percent, current_price, holding = selling_candidates[0]
@@ -118,23 +137,23 @@ class ETFTradingStrategy:
     
     def get_daily_recommendations(self) -> Dict:
         """Get comprehensive daily trading recommendations"""
-        buy_rec = self.get_buy_recommendation()
-        sell_rec = self.get_sell_recommendation()
+        # Rank and group holdings once; every section below reads the same snapshot
+        rankings = self.data_manager.get_etf_rankings()
+        holdings = self.data_manager.get_current_holdings()
         
-        # Get portfolio summary
-        portfolio_summary = self.data_manager.get_portfolio_summary()
+        buy_rec = self.get_buy_recommendation(rankings, holdings)
+        sell_rec = self.get_sell_recommendation(holdings)
         
-        # Get current rankings for display
-        rankings = self.data_manager.get_etf_rankings()
-        top_10_rankings = rankings[:10] if len(rankings) >= 10 else rankings
+        # Get portfolio summary
+        portfolio_summary = self.data_manager.get_portfolio_summary(holdings)
         
         return {
-            "date": datetime.now().strftime("%Y-%m-%d"),
+            "date": _today_str(int(time.time()) // 60),
             "buy_recommendation": buy_rec,
             "sell_recommendation": sell_rec,
             "portfolio_summary": portfolio_summary,
-            "top_etf_rankings": top_10_rankings,
-            "held_etfs": list(self.data_manager.get_current_holdings().keys())
+            "top_etf_rankings": rankings[:10],
+            "held_etfs": list(holdings)
         }
     
     def execute_buy_recommendation(self, recommendation: Dict, quantity: int, actual_price: float) -> Dict:
@@ -225,20 +244,29 @@ class ETFTradingStrategy:
         """Get strategy performance statistics"""
         transactions = self.data_manager.data.get("transactions", [])
         
-        total_buys = len([t for t in transactions if t["type"] == "buy"])
-        total_sells = len([t for t in transactions if t["type"] == "sell"])
-        
-        profitable_sells = [t for t in transactions if t["type"] == "sell" and t.get("total_profit", 0) > 0]
-        loss_sells = [t for t in transactions if t["type"] == "sell" and t.get("total_profit", 0) <= 0]
+        # Single pass over the transaction history
+        total_buys = total_sells = profitable_sells = loss_sells = 0
+        total_profit = 0.0
+        for t in transactions:
+            transaction_type = t["type"]
+            if transaction_type == "buy":
+                total_buys += 1
+            elif transaction_type == "sell":
+                total_sells += 1
+                profit = t.get("total_profit", 0)
+                total_profit += profit
+                if profit > 0:
+                    profitable_sells += 1
+                else:
+                    loss_sells += 1
         
-        total_profit = sum(t.get("total_profit", 0) for t in transactions if t["type"] == "sell")
-        win_rate = (len(profitable_sells) / total_sells * 100) if total_sells > 0 else 0
+        win_rate = (profitable_sells / total_sells * 100) if total_sells > 0 else 0
         
         return {
             "total_buy_transactions": total_buys,
             "total_sell_transactions": total_sells,
-            "profitable_sells": len(profitable_sells),
-            "loss_sells": len(loss_sells),
+            "profitable_sells": profitable_sells,
+            "loss_sells": loss_sells,
             "win_rate_percent": round(win_rate, 2),
             "total_realized_profit": round(total_profit, 2),
             "average_profit_per_sell": round(total_profit / total_sells, 2) if total_sells > 0 else 0
@@ -4,27 +4,66 @@ Volume Filter for ETF Trading Strategy
 Filters ETFs based on daily trading volume threshold
 """
 
-import json
-import pandas as pd
+import asyncio
+import hashlib
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
-from etf_data_manager import ETFDataManager
+from typing import Dict, List, Tuple, Optional, Union
+from etf_data_manager import ETFDataManager, dumps_json, loads_json
 from price_fetcher import PriceFetcher
 
+@dataclass(slots=True)
+class VolumeRecord:
+    """Volume snapshot for one ETF; stored on the ETF as a plain dict (to_dict) at the JSON boundary"""
+    symbol: str
+    current_volume: int
+    current_price: float
+    last_updated: str
+    average_volume_5d: int
+    volume_history: Optional[List[float]] = None
+    
+    # Dict-style access for callers written against the old dict result
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+    
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        if data['volume_history'] is None:
+            del data['volume_history']
+        return data
+
+
 class VolumeFilter:
     """Manages volume-based ETF qualification for trading"""
     
+    VOLUME_DATA_TTL = timedelta(hours=4)  # Bulk refreshes skip ETFs whose stored volume data is younger than this
+    MARKET_CLOSE = (15, 30)  # NSE close (local time) - daily volume bars are final after this
+    
     def __init__(self, data_manager: ETFDataManager, price_fetcher: PriceFetcher = None):
         self.data_manager = data_manager
         self.price_fetcher = price_fetcher or PriceFetcher()
         self.volume_config_file = "volume_filter_config.json"
+        self.generation = 0  # Bumped whenever qualification results change, so callers can cache them
+        self._config_digest = None  # SHA-256 of the last config written, minus its timestamp
+        self._lists_cache = None  # (generation, data_manager.etf_names, qualified list, disqualified list)
         self.load_volume_config()
     
     def load_volume_config(self):
         """Load volume filter configuration"""
+        self.generation += 1
         try:
-            with open(self.volume_config_file, 'r') as f:
-                self.config = json.load(f)
+            with open(self.volume_config_file, 'rb') as f:
+                self.config = loads_json(f.read())
+            self._load_qualification_sets()
         except FileNotFoundError:
             # Create default configuration
             self.config = {
@@ -40,58 +79,197 @@ class VolumeFilter:
                     "grace_period_days": 2  # Allow 2 days below threshold
                 }
             }
+            self._load_qualification_sets()
             self.save_volume_config()
     
+    def _load_qualification_sets(self):
+        """Work on sets in memory (O(1) membership and toggles); the config keeps lists on disk"""
+        self._qualified = set(self.config.get("qualified_etfs", []))
+        self._disqualified = set(self.config.get("disqualified_etfs", []))
+    
     def save_volume_config(self):
         """Save volume filter configuration"""
+        self.config["qualified_etfs"] = sorted(self._qualified)
+        self.config["disqualified_etfs"] = sorted(self._disqualified)
         self.config["last_volume_update"] = datetime.now().isoformat()
-        with open(self.volume_config_file, 'w') as f:
-            json.dump(self.config, f, indent=2, default=str)
+        
+        # Skip the write when nothing changed but the time of day - the digest sees the timestamp at day
+        # granularity, so the first check of each day is still persisted even if no ETF flipped
+        content = dict(self.config, last_volume_update=self.config["last_volume_update"][:10])
+        digest = hashlib.sha256(dumps_json(content)).digest()
+        if digest == self._config_digest:
+            return
+        with open(self.volume_config_file, 'wb') as f:
+            f.write(dumps_json(self.config))
+        self._config_digest = digest
     
     def set_volume_threshold(self, threshold: int):
         """Set minimum volume threshold"""
         print(f"📊 Setting volume threshold to {threshold:,}")
         self.config["minimum_volume_threshold"] = threshold
-        self.save_volume_config()
         
-        # Re-evaluate all ETFs with new threshold
-        self.update_all_etf_volume_status()
+        # Re-evaluate all ETFs with new threshold - the stored volumes haven't changed, so no re-fetch
+        self.reclassify_all_etfs()
+        self.data_manager._save_data()
+        self.save_volume_config()
     
-    def fetch_etf_volume_data(self, etf_symbol: str) -> Optional[Dict]:
+    def reclassify_all_etfs(self) -> int:
+        """Re-run the threshold check on every ETF's stored volume data; returns how many were classified"""
+        classified = 0
+        for etf_symbol, etf_data in self.data_manager.data["etfs"].items():
+            volume_data = etf_data.get("volume_data")
+            if volume_data:
+                self._classify(etf_symbol, volume_data)
+                classified += 1
+        return classified
+    
+    def _has_recent_volume_data(self, etf_symbol: str) -> bool:
+        """Whether the volume data stored on the ETF was fetched within VOLUME_DATA_TTL"""
+        volume_data = self.data_manager.data["etfs"].get(etf_symbol, {}).get("volume_data")
+        if not volume_data or not volume_data.get("last_updated"):
+            return False
+        try:
+            fetched_at = datetime.fromisoformat(volume_data["last_updated"])
+        except (TypeError, ValueError):
+            return False
+        return datetime.now() - fetched_at < self.VOLUME_DATA_TTL
+    
+    def fetch_etf_volume_data(self, etf_symbol: str) -> Optional[VolumeRecord]:
         """Fetch volume data for a specific ETF"""
         try:
-            # Get recent price data which includes volume
-            data = self.price_fetcher.fetch_yahoo_finance_data(etf_symbol, period="1mo")
+            # One month of daily bars carries both the latest volume and the averaging window
+            bars = self.price_fetcher.fetch_daily_bars(etf_symbol, period="1mo")
+            if bars is None:
+                return None
             
-            if data and data.get('volume'):
-                # Get historical data for volume averaging
-                historical = self.price_fetcher.fetch_historical_data(
-                    etf_symbol, 
-                    start_date=(datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-                )
-                
-                volume_info = {
-                    'symbol': etf_symbol,
-                    'current_volume': data['volume'],
-                    'current_price': data['current_price'],
-                    'last_updated': datetime.now().isoformat()
-                }
-                
-                # Calculate average volume if historical data available
-                if historical is not None and not historical.empty:
-                    recent_volumes = historical['Volume'].tail(self.config["volume_averaging_days"])
-                    avg_volume = recent_volumes.mean()
-                    volume_info['average_volume_5d'] = int(avg_volume) if not pd.isna(avg_volume) else data['volume']
-                    volume_info['volume_history'] = recent_volumes.tolist()
-                else:
-                    volume_info['average_volume_5d'] = data['volume']
-                
-                return volume_info
+            return self._volume_info_from_bars(etf_symbol, *bars)
                 
         except Exception as e:
             print(f"❌ Error fetching volume for {etf_symbol}: {e}")
             return None
     
+    def _volume_info_from_bars(self, etf_symbol: str, closes: np.ndarray, volumes: np.ndarray,
+                               average_volume: float = None) -> Optional[VolumeRecord]:
+        """Build volume info from daily bars already in hand (one month of chart data is plenty)"""
+        if closes.size == 0:
+            return None
+        
+        current_volume = int(np.nan_to_num(volumes[-1]))
+        if not current_volume:
+            return None
+        
+        recent_volumes = volumes[-self.config["volume_averaging_days"]:]
+        recent_volumes = recent_volumes[~np.isnan(recent_volumes)]
+        if average_volume is None and recent_volumes.size:
+            average_volume = recent_volumes.mean()
+        
+        return VolumeRecord(
+            symbol=etf_symbol,
+            current_volume=current_volume,
+            current_price=round(float(closes[-1]), 2),
+            last_updated=datetime.now().isoformat(),
+            average_volume_5d=int(average_volume) if average_volume is not None and not np.isnan(average_volume) else current_volume,
+            # Nothing reads the raw tail back - only persist it when asked to
+            volume_history=recent_volumes.tolist() if self.config.get("store_history") else None
+        )
+    
+    def _average_recent_volumes(self, volume_series: List[np.ndarray]) -> np.ndarray:
+        """Mean of each series' last volume_averaging_days non-missing volumes, computed for all ETFs at once"""
+        days = self.config["volume_averaging_days"]
+        
+        # Right-align every tail in a (n_etfs x days) window, NaN-padding short histories
+        window = np.full((len(volume_series), days), np.nan)
+        for row, volumes in enumerate(volume_series):
+            tail = volumes[-days:]
+            window[row, days - tail.size:] = tail
+        
+        counts = np.count_nonzero(~np.isnan(window), axis=1)
+        sums = np.nansum(window, axis=1)
+        return np.divide(sums, counts, out=np.full(len(volume_series), np.nan), where=counts > 0)
+    
+    def fetch_all_volumes_bulk(self, etf_list: List[str]) -> Dict[str, VolumeRecord]:
+        """
+        Volume info for many ETFs from batched multi-ticker downloads (one request per 10 symbols)
+        
+        Returns:
+            Dictionary of symbol -> volume info for the ETFs Yahoo returned
+        """
+        histories = self.price_fetcher.fetch_history_bulk(etf_list)
+        if not histories:
+            return {}
+        
+        symbols = list(histories)
+        averages = self._average_recent_volumes([histories[symbol][1] for symbol in symbols])
+        
+        results = {}
+        for symbol, average_volume in zip(symbols, averages):
+            closes, volumes = histories[symbol]
+            volume_data = self._volume_info_from_bars(symbol, closes, volumes, average_volume)
+            if volume_data:
+                results[symbol] = volume_data
+        return results
+    
+    async def fetch_all_volume_data_async(self, etf_list: List[str], max_concurrency: int = 16) -> Dict[str, VolumeRecord]:
+        """
+        Fetch volume info for many ETFs concurrently from Yahoo's chart endpoint
+        
+        Args:
+            etf_list: ETF symbols to fetch
+            max_concurrency: Upper bound on in-flight Yahoo requests
+        
+        Returns:
+            Dictionary of symbol -> volume info for the ETFs that returned data
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        fetcher = self.price_fetcher
+        
+        async def fetch_one(client, symbol: str):
+            async with semaphore:
+                # Retries with exponential backoff on 429/5xx
+                chart = await fetcher.fetch_yahoo_chart_async(client, fetcher.to_yahoo_symbol(symbol))
+            
+            if chart is None:
+                # Chart endpoint refused - fall back to the blocking yfinance path off-loop
+                return symbol, await asyncio.to_thread(self.fetch_etf_volume_data, symbol)
+            return symbol, self._volume_info_from_bars(symbol, chart['close'], chart['volume'])
+        
+        # Reuse the long-lived pooled client when the host app provided one
+        client = fetcher.async_client
+        owns_client = client is None
+        if owns_client:
+            client = fetcher.create_async_client(max_connections=max_concurrency)
+        
+        try:
+            results = await asyncio.gather(*(fetch_one(client, symbol) for symbol in etf_list))
+        finally:
+            if owns_client:
+                await client.aclose()
+        
+        return {symbol: volume_data for symbol, volume_data in results if volume_data}
+    
+    def fetch_all_volume_data_threaded(self, etf_list: List[str], max_workers: int = 16) -> Dict[str, VolumeRecord]:
+        """
+        Thread-pool alternative to fetch_all_volume_data_async (usable where an event loop is already running)
+        
+        Each worker takes a token from the fetcher's shared rate limiter before hitting Yahoo.
+        
+        Returns:
+            Dictionary of symbol -> volume info for the ETFs that returned data
+        """
+        def fetch_one(symbol: str) -> Optional[VolumeRecord]:
+            with self.price_fetcher.limiter:
+                return self.fetch_etf_volume_data(symbol)
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(fetch_one, symbol): symbol for symbol in etf_list}
+            for future in as_completed(futures):
+                volume_data = future.result()
+                if volume_data:
+                    results[futures[future]] = volume_data
+        
+        return results
+    
     def update_etf_volume_status(self, etf_symbol: str) -> bool:
         """Update volume status for a specific ETF"""
         volume_data = self.fetch_etf_volume_data(etf_symbol)
@@ -99,36 +277,70 @@ class VolumeFilter:
         if not volume_data:
             return False
         
+        return self._apply_volume_data(etf_symbol, volume_data)
+    
+    def _apply_volume_data(self, etf_symbol: str, volume_data: VolumeRecord) -> bool:
+        """Record fetched volume info on the ETF and update its qualification"""
         # Update ETF data with volume information
         if etf_symbol in self.data_manager.data["etfs"]:
-            self.data_manager.data["etfs"][etf_symbol]["volume_data"] = volume_data
-            
-            # Determine qualification status
-            avg_volume = volume_data.get('average_volume_5d', volume_data['current_volume'])
-            is_qualified = avg_volume >= self.config["minimum_volume_threshold"]
-            
-            self.data_manager.data["etfs"][etf_symbol]["volume_qualified"] = is_qualified
+            self.data_manager.data["etfs"][etf_symbol]["volume_data"] = volume_data.to_dict()
             self.data_manager.data["etfs"][etf_symbol]["volume_last_check"] = datetime.now().isoformat()
-            
-            # Update qualified/disqualified lists
-            if is_qualified:
-                if etf_symbol not in self.config["qualified_etfs"]:
-                    self.config["qualified_etfs"].append(etf_symbol)
-                if etf_symbol in self.config["disqualified_etfs"]:
-                    self.config["disqualified_etfs"].remove(etf_symbol)
-            else:
-                if etf_symbol not in self.config["disqualified_etfs"]:
-                    self.config["disqualified_etfs"].append(etf_symbol)
-                if etf_symbol in self.config["qualified_etfs"]:
-                    self.config["qualified_etfs"].remove(etf_symbol)
-            
-            print(f"📊 {etf_symbol}: Volume {avg_volume:,} - {'✅ Qualified' if is_qualified else '❌ Disqualified'}")
+            self._classify(etf_symbol, volume_data)
             return True
         
         return False
     
-    def update_all_etf_volume_status(self):
-        """Update volume status for all ETFs"""
+    def _classify(self, etf_symbol: str, volume_data: Union[VolumeRecord, Dict]) -> bool:
+        """Apply the volume threshold to an ETF's volume data (fresh record or stored dict); returns whether it qualifies"""
+        # Determine qualification status
+        avg_volume = volume_data.get('average_volume_5d', volume_data['current_volume'])
+        is_qualified = avg_volume >= self.config["minimum_volume_threshold"]
+        
+        self.data_manager.data["etfs"][etf_symbol]["volume_qualified"] = is_qualified
+        self.data_manager.invalidate_volume_flags()
+        self.generation += 1
+        
+        # Update qualified/disqualified lists
+        if is_qualified:
+            self._qualified.add(etf_symbol)
+            self._disqualified.discard(etf_symbol)
+        else:
+            self._disqualified.add(etf_symbol)
+            self._qualified.discard(etf_symbol)
+        
+        print(f"📊 {etf_symbol}: Volume {avg_volume:,} - {'✅ Qualified' if is_qualified else '❌ Disqualified'}")
+        return is_qualified
+    
+    def last_session_close(self, now: datetime = None) -> datetime:
+        """Close of the most recent completed trading session (weekends skipped, holidays not)"""
+        now = now or datetime.now()
+        hour, minute = self.MARKET_CLOSE
+        close = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if now < close:
+            close -= timedelta(days=1)
+        while close.weekday() >= 5:
+            close -= timedelta(days=1)
+        return close
+    
+    def _volume_checked_since(self, etf_symbol: str, since: datetime) -> bool:
+        """Whether the ETF's volume was last checked at or after `since`"""
+        last_check = self.data_manager.data["etfs"][etf_symbol].get("volume_last_check")
+        if not last_check:
+            return False
+        try:
+            return datetime.fromisoformat(last_check) >= since
+        except (TypeError, ValueError):
+            return False
+    
+    def update_all_etf_volume_status(self, use_threads: bool = None, force: bool = False):
+        """
+        Update volume status for all ETFs
+        
+        Args:
+            use_threads: Fetch with a thread pool instead of asyncio; defaults to threads
+                         only when called from inside a running event loop
+            force: Re-fetch every ETF, even those checked since the last session close or within VOLUME_DATA_TTL
+        """
         print(f"\n📊 Updating Volume Status for All ETFs")
         print(f"Minimum Volume Threshold: {self.config['minimum_volume_threshold']:,}")
         print("-" * 50)
@@ -137,19 +349,43 @@ class VolumeFilter:
         qualified_count = 0
         total_processed = 0
         
-        for i, etf_symbol in enumerate(etf_list, 1):
-            print(f"Processing {i}/{len(etf_list)}: {etf_symbol}")
-            
-            if self.update_etf_volume_status(etf_symbol):
+        # Daily volume only changes once per session - ETFs checked since the last close, or whose
+        # stored volume data is younger than VOLUME_DATA_TTL, keep their status
+        fresh = set()
+        if not force:
+            session_close = self.last_session_close()
+            fresh = {
+                etf_symbol for etf_symbol in etf_list
+                if self._volume_checked_since(etf_symbol, session_close) or self._has_recent_volume_data(etf_symbol)
+            }
+            if fresh:
+                print(f"⏭️ {len(fresh)} ETFs already checked recently - skipping")
+        stale = [etf_symbol for etf_symbol in etf_list if etf_symbol not in fresh]
+        
+        if use_threads is None:
+            try:
+                asyncio.get_running_loop()
+                use_threads = True  # asyncio.run() can't nest inside a running loop
+            except RuntimeError:
+                use_threads = False
+        
+        # Batched multi-ticker downloads first; only symbols they missed are fetched one by one,
+        # concurrently (bounded, with backoff on 429s). Results are applied in this thread.
+        results = self.fetch_all_volumes_bulk(stale) if stale else {}
+        missing = [etf_symbol for etf_symbol in stale if etf_symbol not in results]
+        if missing:
+            if use_threads:
+                results.update(self.fetch_all_volume_data_threaded(missing))
+            else:
+                results.update(asyncio.run(self.fetch_all_volume_data_async(missing)))
+        print(f"📡 Fetched volume data for {len(results)}/{len(stale)} ETFs")
+        
+        for etf_symbol in etf_list:
+            volume_data = results.get(etf_symbol)
+            if etf_symbol in fresh or (volume_data and self._apply_volume_data(etf_symbol, volume_data)):
                 total_processed += 1
                 if self.data_manager.data["etfs"][etf_symbol].get("volume_qualified", False):
                     qualified_count += 1
-            
-            # Rate limiting
-            if i % 10 == 0:
-                print(f"   Progress: {i}/{len(etf_list)} completed...")
-                import time
-                time.sleep(2)  # Pause to avoid rate limiting
         
         # Save updated data
         self.data_manager._save_data()
@@ -162,48 +398,67 @@ class VolumeFilter:
         
         return qualified_count, total_processed
     
+    def _qualification_lists(self) -> Tuple[List[str], List[str]]:
+        """Qualified and disqualified ETFs in store order, rebuilt in one scan only when results or the ETF list change"""
+        etf_names = self.data_manager.etf_names
+        cached = self._lists_cache
+        if cached is None or cached[0] != self.generation or cached[1] is not etf_names:
+            qualified, disqualified = [], []
+            for etf_symbol, etf_data in self.data_manager.data["etfs"].items():
+                flag = etf_data.get("volume_qualified")
+                if flag:
+                    qualified.append(etf_symbol)
+                elif flag is False:  # Explicitly False, not None
+                    disqualified.append(etf_symbol)
+            cached = (self.generation, etf_names, qualified, disqualified)
+            self._lists_cache = cached
+        return cached[2], cached[3]
+    
     def get_qualified_etfs(self) -> List[str]:
-        """Get list of volume-qualified ETFs"""
+        """Get list of volume-qualified ETFs (cached - don't mutate the result)"""
         if not self.config["volume_check_enabled"]:
             return list(self.data_manager.data["etfs"].keys())
         
-        qualified = []
-        for etf_symbol, etf_data in self.data_manager.data["etfs"].items():
-            if etf_data.get("volume_qualified", False):
-                qualified.append(etf_symbol)
-        
-        return qualified
+        return self._qualification_lists()[0]
     
     def get_disqualified_etfs(self) -> List[str]:
-        """Get list of volume-disqualified ETFs"""
-        disqualified = []
-        for etf_symbol, etf_data in self.data_manager.data["etfs"].items():
-            if etf_data.get("volume_qualified") == False:  # Explicitly False, not None
-                disqualified.append(etf_symbol)
-        
-        return disqualified
+        """Get list of volume-disqualified ETFs (cached - don't mutate the result)"""
+        return self._qualification_lists()[1]
     
-    def get_volume_report(self) -> Dict:
-        """Generate comprehensive volume report"""
+    def get_volume_report(self, top_n: Optional[int] = 10) -> Dict:
+        """
+        Generate comprehensive volume report
+        
+        Args:
+            top_n: Keep only the N highest-volume qualified ETFs in volume_stats (None for all, fully sorted)
+        """
         qualified_etfs = self.get_qualified_etfs()
         disqualified_etfs = self.get_disqualified_etfs()
         
-        # Get volume statistics
-        volume_stats = []
-        for etf_symbol in qualified_etfs:
-            etf_data = self.data_manager.data["etfs"][etf_symbol]
-            volume_data = etf_data.get("volume_data", {})
-            
-            if volume_data:
-                volume_stats.append({
-                    'symbol': etf_symbol,
-                    'current_volume': volume_data.get('current_volume', 0),
-                    'average_volume': volume_data.get('average_volume_5d', 0),
-                    'current_price': volume_data.get('current_price', 0)
-                })
+        # Get volume statistics - average volumes go into one array; rows are built only for the ETFs reported
+        etfs = self.data_manager.data["etfs"]
+        with_data = [etf_symbol for etf_symbol in qualified_etfs if etfs[etf_symbol].get("volume_data")]
+        average_volumes = np.fromiter(
+            (etfs[etf_symbol]["volume_data"].get('average_volume_5d', 0) for etf_symbol in with_data),
+            dtype=np.int64, count=len(with_data)
+        )
+        
+        # Sort by volume (highest first) - partition out the top N before sorting when only they are shown
+        if top_n is not None and top_n < average_volumes.size:
+            order = np.argpartition(-average_volumes, top_n)[:top_n]
+        else:
+            order = np.arange(average_volumes.size)
+        order = order[np.argsort(-average_volumes[order], kind='stable')]
         
-        # Sort by volume (highest first)
-        volume_stats.sort(key=lambda x: x['average_volume'], reverse=True)
+        volume_stats = []
+        for i in order:
+            volume_data = etfs[with_data[i]]["volume_data"]
+            volume_stats.append({
+                'symbol': with_data[i],
+                'current_volume': volume_data.get('current_volume', 0),
+                'average_volume': int(average_volumes[i]),
+                'current_price': volume_data.get('current_price', 0)
+            })
         
         return {
             'threshold': self.config["minimum_volume_threshold"],
@@ -217,41 +472,51 @@ class VolumeFilter:
             'filter_enabled': self.config["volume_check_enabled"]
         }
     
-    def display_volume_report(self):
-        """Display formatted volume report"""
-        report = self.get_volume_report()
-        
-        print(f"\n📊 ETF Volume Qualification Report")
-        print("=" * 50)
-        print(f"Minimum Volume Threshold: {report['threshold']:,}")
-        print(f"Volume Filter Enabled: {report['filter_enabled']}")
-        print(f"Last Updated: {report['last_updated'][:19] if report['last_updated'] else 'Never'}")
-        
-        print(f"\n📈 Summary:")
-        print(f"   Total ETFs: {report['total_etfs']}")
-        print(f"   ✅ Qualified: {report['qualified_count']}")
-        print(f"   ❌ Disqualified: {report['disqualified_count']}")
-        print(f"   📊 Qualification Rate: {(report['qualified_count']/report['total_etfs']*100):.1f}%")
-        
-        print(f"\n✅ Top 10 Qualified ETFs by Volume:")
-        print(f"{'Rank':<5}{'ETF':<12}{'Avg Volume':<12}{'Current Vol':<12}{'Price'}")
-        print("-" * 55)
+    def format_volume_report(self, report: Dict = None) -> str:
+        """Render the volume report as one string"""
+        report = report or self.get_volume_report()
+        threshold = report['threshold']
+        etfs = self.data_manager.data["etfs"]
+        
+        buf = [
+            f"\n📊 ETF Volume Qualification Report\n",
+            "=" * 50 + "\n",
+            f"Minimum Volume Threshold: {threshold:,}\n",
+            f"Volume Filter Enabled: {report['filter_enabled']}\n",
+            f"Last Updated: {report['last_updated'][:19] if report['last_updated'] else 'Never'}\n",
+            f"\n📈 Summary:\n",
+            f"   Total ETFs: {report['total_etfs']}\n",
+            f"   ✅ Qualified: {report['qualified_count']}\n",
+            f"   ❌ Disqualified: {report['disqualified_count']}\n",
+            f"   📊 Qualification Rate: {(report['qualified_count']/report['total_etfs']*100):.1f}%\n",
+            f"\n✅ Top 10 Qualified ETFs by Volume:\n",
+            f"{'Rank':<5}{'ETF':<12}{'Avg Volume':<12}{'Current Vol':<12}{'Price'}\n",
+            "-" * 55 + "\n"
+        ]
         for i, etf in enumerate(report['volume_stats'][:10], 1):
-            print(f"{i:<5}{etf['symbol']:<12}{etf['average_volume']:<12,}{etf['current_volume']:<12,}₹{etf['current_price']:.2f}")
-        
-        if report['disqualified_etfs']:
-            print(f"\n❌ Disqualified ETFs (Volume < {report['threshold']:,}):")
-            for i, etf in enumerate(report['disqualified_etfs'][:10], 1):
-                etf_data = self.data_manager.data["etfs"][etf].get("volume_data", {})
-                volume = etf_data.get('average_volume_5d', 0)
-                print(f"   {i}. {etf}: {volume:,}")
+            buf.append(f"{i:<5}{etf['symbol']:<12}{etf['average_volume']:<12,}{etf['current_volume']:<12,}₹{etf['current_price']:.2f}\n")
+        
+        disqualified_etfs = report['disqualified_etfs']
+        if disqualified_etfs:
+            buf.append(f"\n❌ Disqualified ETFs (Volume < {threshold:,}):\n")
+            for i, etf in enumerate(disqualified_etfs[:10], 1):
+                volume = etfs[etf].get("volume_data", {}).get('average_volume_5d', 0)
+                buf.append(f"   {i}. {etf}: {volume:,}\n")
             
-            if len(report['disqualified_etfs']) > 10:
-                print(f"   ... and {len(report['disqualified_etfs']) - 10} more")
+            if len(disqualified_etfs) > 10:
+                buf.append(f"   ... and {len(disqualified_etfs) - 10} more\n")
+        
+        return "".join(buf)
+    
+    def display_volume_report(self):
+        """Display formatted volume report"""
+        # Build the whole report and write it once instead of one print per line
+        sys.stdout.write(self.format_volume_report())
     
     def enable_volume_filter(self, enabled: bool = True):
         """Enable or disable volume filtering"""
         self.config["volume_check_enabled"] = enabled
+        self.generation += 1
         self.save_volume_config()
         
         status = "enabled" if enabled else "disabled"